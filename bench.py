@@ -0,0 +1,279 @@
+"""Load-test the MCP server endpoints against a PokeAPI stand-in and a fake LLM
+
+Runs the app in-process (or on localhost with --server) with PokeAPI answered by
+the pokeapi_standin app (deterministic synthetic fixtures, or a recorded
+cassette via --pokeapi-url) and every LLM chain answered by the stub backend
+with a fixed latency, so results depend only on the server code and can be
+diffed between commits:
+
+    python bench.py --concurrency 16 --requests 200 --output bench-results.json
+"""
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+
+from pokeapi_standin import SYNTHETIC_NAMES, Cassette, create_app, synthetic_pokeapi
+
+SCENARIO_NAMES = ["pokemon", "description", "compare", "battle", "battle_fast", "counters", "team"]
+LOOP_LAG_INTERVAL = 0.005  # Seconds between event-loop lag probes
+
+TEAM_DESCRIPTIONS = [
+    "a balanced team for the Elite Four",
+    "a fast offensive team built around special attackers",
+    "a defensive team that can stall out opponents",
+    "a team with strong type coverage for a rain-themed playthrough",
+]
+
+
+def install_pokeapi_standin(cmcp, args: argparse.Namespace):
+    """Point the server's PokeAPI client at an in-process stand-in unless --pokeapi-url is given"""
+    if not args.pokeapi_url:
+        # In-process PokeAPI stand-in serving the synthetic fixtures
+        standin = create_app(
+            Cassette(fixtures=synthetic_pokeapi(args.seed)),
+            latency=args.pokeapi_latency,
+            jitter=args.pokeapi_jitter,
+            seed=args.seed
+        )
+        cmcp.pokeapi_client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=standin))
+
+
+def scenario_request(scenario: str, rng: random.Random) -> Tuple[str, str, Dict[str, Any]]:
+    """(method, path, query params) for one request of a scenario"""
+    first, second = rng.sample(SYNTHETIC_NAMES, 2)
+    if scenario == "pokemon":
+        return "GET", f"/pokemon/{first}", {}
+    if scenario == "description":
+        return "GET", f"/pokemon/{first}/description", {}
+    if scenario == "compare":
+        return "GET", f"/compare/{first}/{second}", {}
+    if scenario == "battle":
+        return "GET", f"/battle/{first}/{second}", {}
+    if scenario == "battle_fast":
+        return "GET", f"/battle/{first}/{second}", {"mode": "fast"}
+    if scenario == "counters":
+        return "GET", f"/counters/{first}", {}
+    if scenario == "team":
+        return "POST", "/team/generate", {"description": rng.choice(TEAM_DESCRIPTIONS)}
+    raise ValueError(f"Unknown scenario '{scenario}'")
+
+
+async def monitor_loop_lag(samples: List[float], stop: threading.Event):
+    """Record how late each short sleep wakes up; large values mean the loop was blocked"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        samples.append(time.perf_counter() - started - LOOP_LAG_INTERVAL)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ms = np.array(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "mean": round(float(ms.mean()), 3),
+        "max": round(float(ms.max()), 3)
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, args: argparse.Namespace,
+                       start_lag_monitor: Callable[[List[float], threading.Event], Any]) -> Dict[str, Any]:
+    rng = random.Random(f"{args.seed}-{scenario}")
+    requests = [scenario_request(scenario, rng) for _ in range(args.warmup + args.requests)]
+    warmup, measured = requests[:args.warmup], requests[args.warmup:]
+
+    for method, path, params in warmup:
+        await client.request(method, path, params=params)
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in measured:
+        queue.put_nowait(request)
+
+    async def worker():
+        while not queue.empty():
+            method, path, params = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    lag_samples: List[float] = []
+    stop = threading.Event()
+    monitor = start_lag_monitor(lag_samples, stop)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await (monitor if isinstance(monitor, asyncio.Future) else asyncio.wrap_future(monitor))
+
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": len(measured),
+        "errors": errors,
+        "status_counts": dict(sorted(statuses.items())),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(measured) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+        "event_loop_lag_ms": summarize(lag_samples)
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app) -> Tuple[Any, asyncio.AbstractEventLoop, threading.Thread, int]:
+    """Serve the app with uvicorn on a background thread; returns (server, its loop, thread, port)"""
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(server.serve(),), daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Benchmark server failed to start")
+        time.sleep(0.05)
+    return server, loop, thread, port
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # Reproducible runs: no persistent stores, nothing left over from earlier runs
+    os.environ["POKEMON_STORE_PATH"] = ""
+    os.environ["LLM_CACHE_PATH"] = ""
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["LLM_STUB_LATENCY"] = str(args.llm_latency)
+    os.environ["LLM_STUB_RATE_LIMIT"] = str(args.llm_quota)
+    os.environ["LLM_RATE_LIMIT"] = str(args.llm_rate_limit)
+    os.environ["LLM_BATCH_WINDOW_MS"] = str(args.batch_window_ms)
+    if args.pokeapi_url:
+        os.environ["POKEAPI_BASE_URL"] = args.pokeapi_url
+    import cmcp
+
+    install_pokeapi_standin(cmcp, args)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: Dict[str, Any] = {}
+
+    if args.server:
+        server, server_loop, thread, port = start_server(cmcp.app)
+
+        def start_lag_monitor(samples, stop):
+            return asyncio.run_coroutine_threadsafe(monitor_loop_lag(samples, stop), server_loop)
+
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits,
+                                         timeout=args.timeout) as client:
+                for scenario in args.scenarios:
+                    results[scenario] = await run_scenario(client, scenario, args, start_lag_monitor)
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+    else:
+        def start_lag_monitor(samples, stop):
+            return asyncio.ensure_future(monitor_loop_lag(samples, stop))
+
+        async with cmcp.lifespan(cmcp.app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=cmcp.app), base_url="http://bench",
+                                         timeout=args.timeout) as client:
+                for scenario in args.scenarios:
+                    results[scenario] = await run_scenario(client, scenario, args, start_lag_monitor)
+
+    return {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "mode": "server" if args.server else "in-process",
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "warmup": args.warmup,
+            "pokeapi_url": args.pokeapi_url,
+            "pokeapi_latency": args.pokeapi_latency,
+            "pokeapi_jitter": args.pokeapi_jitter,
+            "llm_latency": args.llm_latency,
+            "llm_quota": args.llm_quota,
+            "llm_rate_limit": args.llm_rate_limit,
+            "batch_window_ms": args.batch_window_ms,
+            "seed": args.seed
+        },
+        "scenarios": results
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP server endpoints")
+    parser.add_argument("--scenarios", default=",".join(SCENARIO_NAMES),
+                        help=f"Comma separated subset of: {', '.join(SCENARIO_NAMES)}")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client requests")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each scenario")
+    parser.add_argument("--pokeapi-latency", type=float, default=0.05, help="Simulated PokeAPI latency in seconds")
+    parser.add_argument("--pokeapi-jitter", type=float, default=0.0, help="Extra random PokeAPI latency, up to this many seconds")
+    parser.add_argument("--pokeapi-url", help="Use a running pokeapi_standin.py (e.g. http://127.0.0.1:8001/api/v2/) "
+                                              "instead of the in-process synthetic one; --pokeapi-latency/jitter then do not apply")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM latency in seconds")
+    parser.add_argument("--llm-quota", type=float, default=0,
+                        help="Stub LLM calls per second before it answers with 429 quota errors (0 disables)")
+    parser.add_argument("--llm-rate-limit", type=float, default=0,
+                        help="Server-side LLM_RATE_LIMIT ceiling in calls per second (0: adaptive only, no ceiling)")
+    parser.add_argument("--batch-window-ms", type=float, default=20, help="Description micro-batching window (0 disables)")
+    parser.add_argument("--timeout", type=float, default=60, help="Client timeout per request in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fixtures and request mix")
+    parser.add_argument("--server", action="store_true", help="Serve over HTTP on localhost instead of in-process")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIO_NAMES]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
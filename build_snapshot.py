@@ -0,0 +1,142 @@
+"""Build an offline Pokedex snapshot for POKEMON_DATA_MODE=offline
+
+Downloads every species (default form) and the type chart from PokeAPI with
+bounded concurrency. Each finished species is appended to a JSONL checkpoint,
+so an interrupted run picks up where it stopped when started again with the
+same output path.
+
+    python build_snapshot.py --output pokedex_snapshot.json.gz
+"""
+from typing import List, Dict, Any, Set
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+import httpx
+
+from pokeapi import PokeAPIClient, english_flavor_text, fetch_type_chart, normalize_pokemon, write_snapshot
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger("build_snapshot")
+
+MAX_ATTEMPTS = 4
+
+
+async def fetch_with_retries(client: PokeAPIClient, path: str) -> Dict[str, Any]:
+    """GET a resource, backing off on network errors and 429/5xx responses"""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return await client.get_json(path)
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if (status != 429 and status < 500) or attempt == MAX_ATTEMPTS:
+                raise
+        except httpx.RequestError:
+            if attempt == MAX_ATTEMPTS:
+                raise
+        await asyncio.sleep(2 ** attempt * 0.5)
+
+
+async def fetch_species_record(client: PokeAPIClient, species_name: str) -> Dict[str, Any]:
+    """Fetch one species and its default form as a snapshot record"""
+    species = await fetch_with_retries(client, f"pokemon-species/{species_name}")
+    default_variety = next(
+        (variety["pokemon"]["name"] for variety in species["varieties"] if variety["is_default"]),
+        species_name
+    )
+    pokemon = await fetch_with_retries(client, f"pokemon/{default_variety}")
+
+    record = normalize_pokemon(pokemon)
+    record["species"] = species["name"]
+    record["flavor_text"] = english_flavor_text(species)
+    return record
+
+
+def read_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load finished records from a previous run, ignoring a torn last line"""
+    records: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["species"]] = record
+    return records
+
+
+async def build(args: argparse.Namespace) -> int:
+    checkpoint_path = args.checkpoint or f"{args.output}.checkpoint.jsonl"
+    client = PokeAPIClient(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        max_connections=args.concurrency,
+        max_keepalive=args.concurrency,
+        keepalive_expiry=30,
+        per_host_limit=args.concurrency
+    )
+
+    try:
+        type_chart = await fetch_type_chart(lambda path: fetch_with_retries(client, path))
+        species_list = await fetch_with_retries(client, "pokemon-species?limit=100000")
+        species_names = [species["name"] for species in species_list["results"]]
+        if args.limit:
+            species_names = species_names[:args.limit]
+
+        records = read_checkpoint(checkpoint_path)
+        pending = [name for name in species_names if name not in records]
+        logger.info(f"{len(species_names)} species, {len(records)} already checkpointed, {len(pending)} to fetch")
+
+        failed: Set[str] = set()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            async def fetch_one(species_name: str):
+                async with semaphore:
+                    try:
+                        record = await fetch_species_record(client, species_name)
+                    except (httpx.HTTPError, KeyError, ValueError) as e:
+                        logger.warning(f"Failed to fetch {species_name}: {e}")
+                        failed.add(species_name)
+                        return
+                records[species_name] = record
+                checkpoint.write(json.dumps(record, separators=(",", ":")) + "\n")
+                checkpoint.flush()
+                if len(records) % 100 == 0:
+                    logger.info(f"{len(records)}/{len(species_names)} species fetched")
+
+            await asyncio.gather(*(fetch_one(name) for name in pending))
+    finally:
+        await client.close()
+
+    if failed and not args.allow_partial:
+        logger.error(f"{len(failed)} species failed; re-run to resume, or pass --allow-partial")
+        return 1
+
+    snapshot_records: List[Dict[str, Any]] = [records[name] for name in species_names if name in records]
+    write_snapshot(args.output, snapshot_records, source=args.base_url, type_chart=type_chart)
+    os.remove(checkpoint_path)
+    logger.info(f"Wrote {len(snapshot_records)} Pokemon to {args.output}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build an offline Pokedex snapshot from PokeAPI")
+    parser.add_argument("--output", default="pokedex_snapshot.json.gz", help="Snapshot file to write")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--base-url", default="https://pokeapi.co/api/v2/", help="PokeAPI base URL")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent PokeAPI requests")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds")
+    parser.add_argument("--limit", type=int, default=0, help="Only fetch the first N species")
+    parser.add_argument("--allow-partial", action="store_true", help="Write the snapshot even if some species failed")
+    return asyncio.run(build(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,71 @@
-from fastapi import FastAPI, HTTPException, Query
+import time
+
+# Taken before the library imports, which are most of the cold-start cost: the "import" startup
+# phase covers the whole module and "libraries" the imports alone
+_import_started = time.perf_counter()
+
+from fastapi import Body, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
-import requests
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Literal, Union
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import heapq
+import httpx
 import logging
+import numpy as np
 import os
 from dotenv import load_dotenv
-from langchain_google_genai import GoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import hashlib
+import itertools
 import json
-import requests
+import math
 import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
 from datetime import datetime
+from urllib.parse import parse_qs
+from metrics import Registry, record_span, request_trace, span
+from pokeapi import PokeAPIClient, PokedexSnapshot, fetch_type_chart, normalize_pokemon
+from shared_cache import SharedCache
+
+_libraries_imported = time.perf_counter()
 
 #  Load environment variables 
 load_dotenv()
-os.environ['GEMINI_API_KEY'] = os.getenv("GEMINI_API_KEY")
 
 # --- Server-Side Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; keep PokeAPI traffic out of the server log
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# --- JSON Encoding ---
+# orjson is several times faster than the stdlib encoder; fall back to json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_bytes(value: Any) -> bytes:
+    """Compact UTF-8 JSON, as JSONResponse would render it"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class; encodes with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
 
 
 # Pydantic Models for Structured AI Agent Communication
@@ -54,7 +99,13 @@ class TeamRequest(BaseModel):
     
     description: str = Field(..., description="Natural language description of desired team")
     include_stats: bool = Field(default=True, description="Include Pokemon stats from PokeAPI")
-    max_retries: int = Field(default=3, description="Max retries for invalid Pokemon names")
+    max_retries: int = Field(default=3, ge=0, le=5, description="Max retries for invalid Pokemon names")
+
+
+class BatchLookupRequest(BaseModel):
+
+    names: List[Union[str, int]] = Field(..., description="Pokemon names or Pokedex ids to look up")
+    include_description: bool = Field(default=False, description="Generate AI descriptions (slower)")
 
 
 class CounterPokemon(BaseModel):
@@ -63,6 +114,7 @@ class CounterPokemon(BaseModel):
     type: str
     reason: str
     sprite: Optional[str] = None
+    score: Optional[float] = None
 
 
 class BattleResult(BaseModel):
@@ -83,12 +135,48 @@ class MCPResponse(BaseModel):
 
 
 #  FastAPI App Initialization 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    global pokedex_snapshot, llm_cache
+    started = time.perf_counter()
+    if POKEDEX_SNAPSHOT_PATH:
+        pokedex_snapshot = PokedexSnapshot.load(POKEDEX_SNAPSHOT_PATH)
+        logger.info(f"Loaded Pokedex snapshot with {len(pokedex_snapshot)} Pokemon from {POKEDEX_SNAPSHOT_PATH}")
+    elif POKEMON_DATA_MODE == "offline":
+        raise RuntimeError("POKEMON_DATA_MODE=offline requires POKEDEX_SNAPSHOT_PATH")
+
+    if LLM_CACHE_PATH:
+        llm_cache = LLMResponseCache(LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES)
+    await pokeapi_client.start()
+    llm_executor.start()
+    # Build the name index in the background so the first lookup does not pay for it
+    warmup = asyncio.ensure_future(get_name_index())
+    if LLM_WARMUP:
+        # Import LangChain and build the chains off the event loop; requests are served meanwhile
+        asyncio.get_running_loop().run_in_executor(None, llm_stack.warm)
+    startup_seconds.set(time.perf_counter() - started, "lifespan")
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        await pokeapi_client.close()
+        if pokemon_store is not None:
+            pokemon_store.close()
+        if llm_cache is not None:
+            llm_cache.close()
+            llm_cache = None
+        llm_executor.shutdown()
+
+
 app = FastAPI(
     title="Pokémon MCP Server - AI Agent Middleware",
     description="Modular Control Platform providing strategic Pokémon data abstractions for AI agents. Combines PokeAPI factual data with AI-powered strategic analysis.",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Configuration 
@@ -100,19 +188,654 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Metrics ---
+# Prometheus text format on /metrics. Hot-path recording is a dict update on the event loop;
+# cache and executor totals are copied in at scrape time by collect_component_metrics.
+metrics = Registry()
+http_request_duration = metrics.histogram(
+    "pokemon_mcp_http_request_duration_seconds", "HTTP request latency by route template and status",
+    ["method", "route", "status"]
+)
+http_requests_in_flight = metrics.gauge("pokemon_mcp_http_requests_in_flight", "HTTP requests being served")
+pokeapi_request_duration = metrics.histogram(
+    "pokemon_mcp_pokeapi_request_duration_seconds", "PokeAPI fetch latency by resource", ["resource"]
+)
+pokeapi_errors = metrics.counter(
+    "pokemon_mcp_pokeapi_errors_total", "Failed PokeAPI fetches by resource and status code or error type",
+    ["resource", "reason"]
+)
+pokeapi_in_flight = metrics.gauge("pokemon_mcp_pokeapi_requests_in_flight", "PokeAPI fetches in progress")
+llm_request_duration = metrics.histogram(
+    "pokemon_mcp_llm_request_duration_seconds", "LLM chain call latency, including queueing", ["chain"]
+)
+llm_errors = metrics.counter("pokemon_mcp_llm_errors_total", "Failed LLM chain calls by error type", ["chain", "reason"])
+llm_in_flight = metrics.gauge("pokemon_mcp_llm_requests_in_flight", "LLM calls running on the executor")
+llm_queued = metrics.gauge("pokemon_mcp_llm_requests_queued", "LLM calls waiting for an executor thread")
+llm_rejected = metrics.counter("pokemon_mcp_llm_rejected_total", "LLM calls shed with 503 because the queue was full")
+llm_queue_wait = metrics.histogram(
+    "pokemon_mcp_llm_queue_wait_seconds", "Time LLM calls waited for a thread and a rate-limit token", ["priority"]
+)
+llm_throttled = metrics.counter("pokemon_mcp_llm_rate_limited_total", "LLM calls that hit a 429/quota error", ["chain"])
+llm_rate = metrics.gauge(
+    "pokemon_mcp_llm_rate_limit", "Current adaptive LLM call rate limit in calls per second (+Inf until a 429)"
+)
+llm_batched_prompts = metrics.counter(
+    "pokemon_mcp_llm_batched_prompts_total", "Description prompts answered by a merged batch call"
+)
+cache_hits = metrics.counter("pokemon_mcp_cache_hits_total", "Cache hits (including coalesced loads)", ["cache"])
+cache_misses = metrics.counter("pokemon_mcp_cache_misses_total", "Cache misses", ["cache"])
+cache_hit_ratio = metrics.gauge("pokemon_mcp_cache_hit_ratio", "Cache hit ratio since startup", ["cache"])
+startup_seconds = metrics.gauge(
+    "pokemon_mcp_startup_seconds", "Startup phase durations: import (libraries included), libraries, lifespan, llm_stack", ["phase"]
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request (until the last body chunk for streams)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the scope; label by template to bound cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], route, str(status))
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+def wants_timing_trace(scope) -> bool:
+    query = scope.get("query_string", b"")
+    return b"debug" in query and "timing" in parse_qs(query.decode("latin-1")).get("debug", [])
+
+
+class ServerTimingMiddleware:
+    """Collects per-request spans; adds a Server-Timing header and, with ?debug=timing, a JSON trace
+
+    Spans finishing after the response headers are sent (streamed bodies) are not in the header.
+    The trace is only injected into JSON object responses; other responses get the header alone.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = wants_timing_trace(scope)
+        with request_trace() as trace:
+            held_start = None
+            body = []
+
+            async def send_with_timing(message):
+                nonlocal held_start
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                    content_type = dict(headers).get(b"content-type", b"")
+                    if debug and content_type.startswith(b"application/json"):
+                        held_start = message
+                        return
+                    await send(message)
+                elif held_start is not None and message["type"] == "http.response.body":
+                    body.append(message.get("body", b""))
+                    if not message.get("more_body", False):
+                        await send_with_trace(held_start, b"".join(body))
+                else:
+                    await send(message)
+
+            async def send_with_trace(start, payload: bytes):
+                try:
+                    data = json.loads(payload)
+                except ValueError:
+                    data = None
+                if isinstance(data, dict):
+                    data["_timing"] = trace.to_dict()
+                    payload = json_bytes(data)
+                # The body changed, so its length and ETag no longer apply, and a per-request
+                # trace must never be served from a shared cache in place of the plain response
+                headers = [(k, v) for k, v in start["headers"]
+                           if k not in (b"content-length", b"etag", b"cache-control")]
+                headers.append((b"content-length", str(len(payload)).encode()))
+                headers.append((b"cache-control", b"no-store"))
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": payload})
+
+            await self.app(scope, receive, send_with_timing)
+
+
+app.add_middleware(ServerTimingMiddleware)
+
+
+def observe_pokeapi_request(resource: str, seconds: float, error: Optional[str]):
+    pokeapi_request_duration.observe(seconds, resource)
+    record_span(f"pokeapi.{resource}", time.perf_counter() - seconds, seconds)
+    if error is not None:
+        pokeapi_errors.inc(resource, error)
+
+
 # PokeAPI Configuration 
-BASE_URL = "https://pokeapi.co/api/v2/"
+# Point at pokeapi_standin.py for offline testing, benchmarks or air-gapped deployments
+BASE_URL = os.getenv("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2/").rstrip("/") + "/"
 REQUEST_TIMEOUT = 10
+POKEAPI_MAX_CONNECTIONS = int(os.getenv("POKEAPI_MAX_CONNECTIONS", "100"))
+POKEAPI_MAX_KEEPALIVE = int(os.getenv("POKEAPI_MAX_KEEPALIVE", "20"))
+POKEAPI_KEEPALIVE_EXPIRY = float(os.getenv("POKEAPI_KEEPALIVE_EXPIRY", "30"))
+POKEAPI_PER_HOST_LIMIT = int(os.getenv("POKEAPI_PER_HOST_LIMIT", "20"))
+
+pokeapi_client = PokeAPIClient(
+    base_url=BASE_URL,
+    timeout=REQUEST_TIMEOUT,
+    max_connections=POKEAPI_MAX_CONNECTIONS,
+    max_keepalive=POKEAPI_MAX_KEEPALIVE,
+    keepalive_expiry=POKEAPI_KEEPALIVE_EXPIRY,
+    per_host_limit=POKEAPI_PER_HOST_LIMIT,
+    observer=observe_pokeapi_request
+)
+
+# --- Cross-Worker Shared Cache ---
+# Memory-mapped table shared by every uvicorn worker on the node, behind the in-process
+# Pokemon cache and in front of the LLM response cache. Put it on tmpfs, e.g. /dev/shm.
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")  # Empty disables the shared tier
+SHARED_CACHE_SLOTS = int(os.getenv("SHARED_CACHE_SLOTS", "4096"))
+SHARED_CACHE_SLOT_BYTES = int(os.getenv("SHARED_CACHE_SLOT_BYTES", "4096"))
+
+
+def open_shared_cache() -> Optional[SharedCache]:
+    if not SHARED_CACHE_PATH:
+        return None
+    try:
+        return SharedCache(SHARED_CACHE_PATH, SHARED_CACHE_SLOTS, SHARED_CACHE_SLOT_BYTES)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Shared cache disabled: {e}")
+        return None
+
+
+shared_cache = open_shared_cache()
+
+# --- In-Process Pokemon Cache ---
+POKEMON_CACHE_SIZE = int(os.getenv("POKEMON_CACHE_SIZE", "2048"))
+POKEMON_CACHE_TTL = float(os.getenv("POKEMON_CACHE_TTL", "86400"))
+
+
+class AsyncTTLCache:
+    """Bounded LRU cache with per-entry TTL and single-flight loading
+
+    With a shared tier, local misses are looked up there (under `namespace`) before
+    loading, and every set is written through, so other workers see the value too.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shared: Optional[SharedCache] = None, namespace: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self.namespace = namespace
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.shared_hits = 0  # Hits answered by the shared tier; included in hits
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+            self.expirations += 1
+        if self.shared is None:
+            return None
+        value = self.shared.get(self.namespace + key)
+        if value is not None:
+            self.shared_hits += 1
+            self._set_local(key, value)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._set_local(key, value)
+        if self.shared is not None:
+            self.shared.set(self.namespace + key, value, self.ttl)
+
+    def _set_local(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, sharing one loader call between concurrent misses"""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            # Nobody may be left awaiting the task if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled caller does not abort the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+        }
+
+
+# Normalized PokemonData dicts keyed by lowercase name and by id
+pokemon_cache = AsyncTTLCache(maxsize=POKEMON_CACHE_SIZE, ttl=POKEMON_CACHE_TTL, shared=shared_cache, namespace="pokemon:")
+
+# --- Persistent PokeAPI Store ---
+POKEMON_STORE_PATH = os.getenv("POKEMON_STORE_PATH", "")  # Empty disables the store
+POKEMON_STORE_MAX_AGE = float(os.getenv("POKEMON_STORE_MAX_AGE", str(30 * 86400)))
+
+
+class SQLiteDatabase:
+    """Per-thread WAL-mode SQLite connections to one database file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class PokemonStore(SQLiteDatabase):
+    """SQLite (WAL mode) store of raw and normalized PokeAPI records shared by all local workers"""
+
+    def __init__(self, path: str, max_age: float):
+        super().__init__(path)
+        self.max_age = max_age
+
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pokemon (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    raw BLOB,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pokemon_keys (
+                    key TEXT PRIMARY KEY,
+                    id INTEGER NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the normalized record for a name/id key, or None if missing or stale"""
+        row = self._connect().execute(
+            """
+            SELECT p.data, p.fetched_at FROM pokemon_keys k
+            JOIN pokemon p ON p.id = k.id
+            WHERE k.key = ?
+            """,
+            (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.max_age:
+            return None
+        return json.loads(row[0])
+
+    def get_raw(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the original PokeAPI payload stored for a name/id key"""
+        row = self._connect().execute(
+            """
+            SELECT p.raw FROM pokemon_keys k
+            JOIN pokemon p ON p.id = k.id
+            WHERE k.key = ?
+            """,
+            (key,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, keys: List[str], record: Dict[str, Any], raw: Optional[Dict[str, Any]] = None):
+        """Insert or refresh a record and point every lookup key at it"""
+        raw_blob = zlib.compress(json.dumps(raw, separators=(",", ":")).encode()) if raw is not None else None
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pokemon (id, name, raw, data, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (record["id"], record["name"].lower(), raw_blob, json.dumps(record), time.time())
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO pokemon_keys (key, id) VALUES (?, ?)",
+                [(key, record["id"]) for key in set(keys)]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        records = self._connect().execute("SELECT COUNT(*) FROM pokemon").fetchone()[0]
+        return {"path": self.path, "records": records, "max_age_seconds": self.max_age}
+
+
+pokemon_store = PokemonStore(POKEMON_STORE_PATH, POKEMON_STORE_MAX_AGE) if POKEMON_STORE_PATH else None
+
+# --- Offline Pokedex Snapshot ---
+# Built with build_snapshot.py. "online" serves snapshot hits locally and falls back to
+# PokeAPI; "offline" answers only from the snapshot and never touches the network.
+POKEDEX_SNAPSHOT_PATH = os.getenv("POKEDEX_SNAPSHOT_PATH", "")
+POKEMON_DATA_MODE = os.getenv("POKEMON_DATA_MODE", "online").lower()
+
+pokedex_snapshot: Optional[PokedexSnapshot] = None
+
+# Small, rarely changing reference data (type chart) loaded once with single-flight
+reference_cache = AsyncTTLCache(maxsize=8, ttl=float("inf"))
+
+
+# --- Name Resolution Index ---
+NAME_INDEX_RETRY_INTERVAL = 60  # Seconds to wait before retrying a failed index build
+MAX_NAME_SUGGESTIONS = 3
+
+# "Alolan Vulpix" -> "vulpix-alola", "Mega Charizard X" -> "charizard-mega-x"
+FORM_PREFIXES = {
+    "alolan": "alola",
+    "galarian": "galar",
+    "hisuian": "hisui",
+    "paldean": "paldea",
+    "mega": "mega",
+    "gigantamax": "gmax"
+}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """PokeAPI slugs with aliases and a trigram index for typo suggestions"""
+
+    def __init__(self, pokemon_names: List[str], species_names: List[str]):
+        self.slugs = set(pokemon_names)
+        self.aliases: Dict[str, str] = {}
+        for slug in pokemon_names:
+            self._add_alias(slug, slug)
+        # Species whose default form has a suffixed slug ("giratina" -> "giratina-altered")
+        for species in species_names:
+            if species not in self.slugs:
+                default_form = next((slug for slug in pokemon_names if slug.startswith(f"{species}-")), None)
+                if default_form is not None:
+                    self._add_alias(species, default_form)
+
+        self.trigrams: Dict[str, set] = {}
+        for key in self.aliases:
+            for gram in self._trigrams(key):
+                self.trigrams.setdefault(gram, set()).add(key)
+
+    def _add_alias(self, name: str, slug: str):
+        key = self.normalize(name)
+        self.aliases.setdefault(key, slug)
+        # "hooh", "mrmime", "porygonz"
+        self.aliases.setdefault(key.replace("-", ""), slug)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Fold a user- or LLM-supplied name onto PokeAPI slug spelling"""
+        name = name.strip().lower().replace("♀", "-f").replace("♂", "-m")
+        name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+        name = re.sub(r"['’.:]", "", name)
+        name = re.sub(r"[\s_]+", "-", name)
+        return re.sub(r"-+", "-", name).strip("-")
+
+    @staticmethod
+    def _trigrams(key: str) -> set:
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical PokeAPI slug for a name or alias, or None if it is not a known Pokemon"""
+        key = self.normalize(name)
+        if key.isdigit():
+            return key
+        if key in self.aliases:
+            return self.aliases[key]
+
+        prefix, _, rest = key.partition("-")
+        if prefix in FORM_PREFIXES and rest:
+            return self._resolve_form(FORM_PREFIXES[prefix], rest)
+        return None
+
+    def _resolve_form(self, suffix: str, rest: str) -> Optional[str]:
+        """Slug for a regional/mega form written prefix-first, falling back to the base species"""
+        # "mega-charizard-x" -> "charizard-mega-x", "galarian-mr-mime" -> "mr-mime-galar"
+        base, _, variant = rest.partition("-")
+        forms = [f"{rest}-{suffix}"] + ([f"{base}-{suffix}-{variant}"] if variant else [])
+        for form in forms:
+            if form in self.aliases:
+                return self.aliases[form]
+        # Only sub-forms exist ("charizard-mega-x"/"-y", "darmanitan-galar-standard"/"-zen"): take the first
+        for form in forms:
+            variants = sorted(slug for slug in self.slugs if slug.startswith(f"{form}-"))
+            if variants:
+                return variants[0]
+        # No such form: the base species is the closest real Pokemon
+        return self.aliases.get(rest)
+
+    def suggest(self, name: str, limit: int = MAX_NAME_SUGGESTIONS) -> List[str]:
+        """Closest known slugs by trigram overlap, re-ranked by edit distance"""
+        key = self.normalize(name)
+        overlap: Dict[str, int] = {}
+        for gram in self._trigrams(key):
+            for candidate in self.trigrams.get(gram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+
+        shortlist = sorted(overlap, key=lambda candidate: -overlap[candidate])[:25]
+        max_distance = max(2, len(key) // 3)
+        ranked = sorted(
+            (distance, -overlap[candidate], candidate)
+            for candidate in shortlist
+            for distance in [_edit_distance(key, candidate)]
+            if distance <= max_distance
+        )
+
+        suggestions: List[str] = []
+        for _, _, candidate in ranked:
+            slug = self.aliases[candidate]
+            if slug not in suggestions:
+                suggestions.append(slug)
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+
+_name_index_failed_at = 0.0
+
+
+async def get_name_index() -> Optional[NameIndex]:
+    """The local name index, or None while it cannot be built (lookups then go straight upstream)"""
+    global _name_index_failed_at
+    if time.monotonic() - _name_index_failed_at < NAME_INDEX_RETRY_INTERVAL:
+        return None
+    try:
+        return await reference_cache.get_or_load("name_index", _load_name_index)
+    except (HTTPException, httpx.HTTPError, KeyError) as e:
+        _name_index_failed_at = time.monotonic()
+        logger.warning(f"Name index unavailable, resolving names upstream: {e}")
+        return None
+
+
+async def _load_name_index() -> NameIndex:
+    # Offline mode can only serve what the snapshot holds, so index exactly that
+    if POKEMON_DATA_MODE == "offline":
+        return NameIndex(
+            [record["name"].lower() for record in pokedex_snapshot.records],
+            [record["species"] for record in pokedex_snapshot.records if record.get("species")]
+        )
+
+    pokemon_list, species_list = await asyncio.gather(
+        pokeapi_client.get_json("pokemon?limit=100000"),
+        pokeapi_client.get_json("pokemon-species?limit=100000")
+    )
+    index = NameIndex(
+        [result["name"] for result in pokemon_list["results"]],
+        [result["name"] for result in species_list["results"]]
+    )
+    logger.info(f"Built name index with {len(index)} Pokemon")
+    return index
+
+
+# --- Type Effectiveness ---
+class TypeChart:
+    """Attacking-by-defending type effectiveness matrix with vectorized lookups"""
+
+    def __init__(self, types: List[str], multipliers: List[List[float]]):
+        self.types = [type_name.lower() for type_name in types]
+        self.index = {type_name: i for i, type_name in enumerate(self.types)}
+        self.matrix = np.asarray(multipliers, dtype=np.float32)
+        if self.matrix.shape != (len(self.types), len(self.types)):
+            raise ValueError(f"Type chart must be {len(self.types)}x{len(self.types)}, got {self.matrix.shape}")
+
+    def indices(self, type_names: List[str]) -> List[int]:
+        """Matrix indices for type names; raises ValueError for unknown types"""
+        try:
+            return [self.index[type_name.strip().lower()] for type_name in type_names]
+        except KeyError as e:
+            raise ValueError(f"Unknown type '{e.args[0]}'")
+
+    def defending_profile(self, defending: List[str]) -> np.ndarray:
+        """Multiplier of every attacking type against a single- or dual-type defender"""
+        return self.matrix[:, self.indices(defending)].prod(axis=1)
+
+    def multiplier(self, attacking: str, defending: List[str]) -> float:
+        """Multiplier of one attacking type against a single- or dual-type defender"""
+        return float(self.matrix[self.indices([attacking])[0], self.indices(defending)].prod())
+
+    def best_multiplier(self, attacking: List[str], defending: List[str]) -> float:
+        """Best multiplier any of the attacker's own types achieves against the defender"""
+        return float(self.matrix[np.ix_(self.indices(attacking), self.indices(defending))].prod(axis=1).max())
+
+
+async def get_type_chart() -> TypeChart:
+    """The type chart, loaded once from the snapshot if it carries one, otherwise from PokeAPI"""
+    return await reference_cache.get_or_load("type_chart", _load_type_chart)
+
+
+async def _load_type_chart() -> TypeChart:
+    if pokedex_snapshot is not None and pokedex_snapshot.type_chart is not None:
+        return TypeChart(**pokedex_snapshot.type_chart)
+    if POKEMON_DATA_MODE == "offline":
+        raise HTTPException(status_code=503, detail="Type chart unavailable: snapshot has no type chart")
+
+    try:
+        chart = await fetch_type_chart(pokeapi_client.get_json)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=503, detail=f"Type chart unavailable: {e}")
+    logger.info("Loaded type chart from PokeAPI")
+    return TypeChart(**chart)
 
 # --- Initialize LLM ---
-llm = GoogleGenerativeAI(
-    model="gemini-1.5-flash",
-    google_api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.7
-)
+# gemini (default), stub (deterministic, offline) or replay (from LLM_RECORD_PATH); see llm_backends.py
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+# Model name used in LLM response-cache keys; non-Gemini backends never share Gemini's entries
+LLM_CACHE_MODEL = LLM_MODEL if LLM_BACKEND in ("gemini", "replay") else f"{LLM_BACKEND}-{LLM_MODEL}"
+# Build the LLM stack in the background at startup instead of on the first LLM-backed request
+LLM_WARMUP = os.getenv("LLM_WARMUP", "true").lower() in ("1", "true", "yes")
+
+if LLM_BACKEND == "gemini" and not os.getenv("GEMINI_API_KEY"):
+    logger.warning("GEMINI_API_KEY is not set; AI-backed endpoints will return 503 until it is configured")
+
+
+class PromptSpec:
+    """Prompt text and variables; becomes a LangChain PromptTemplate when the LLM stack is built"""
+
+    def __init__(self, input_variables: List[str], template: str):
+        self.input_variables = input_variables
+        self.template = template
+
+    def format(self, **inputs) -> str:
+        """Same output as PromptTemplate.format for these f-string templates"""
+        return self.template.format(**inputs)
+
 
 # Prompt Templates 
-description_prompt = PromptTemplate(
+description_prompt = PromptSpec(
     input_variables=["name", "types", "abilities", "stats"],
     template="""
     You are a Pokemon expert. Provide a detailed and engaging description for {name}.
@@ -131,7 +854,7 @@ description_prompt = PromptTemplate(
     """
 )
 
-battle_prompt = PromptTemplate(
+battle_prompt = PromptSpec(
     input_variables=["pokemon1_name", "pokemon1_types", "pokemon1_stats", "pokemon2_name", "pokemon2_types",
                      "pokemon2_stats"],
     template="""
@@ -160,7 +883,7 @@ battle_prompt = PromptTemplate(
     """
 )
 
-counter_prompt = PromptTemplate(
+counter_prompt = PromptSpec(
     input_variables=["target_pokemon", "target_types", "target_stats"],
     template="""
     You are a Pokemon strategy expert. Suggest 3-4 Pokemon that would be effective counters against {target_pokemon}.
@@ -188,7 +911,24 @@ counter_prompt = PromptTemplate(
     """
 )
 
-team_analysis_prompt = PromptTemplate(
+counter_reason_prompt = PromptSpec(
+    input_variables=["target_pokemon", "target_types", "counters"],
+    template="""
+    You are a Pokemon strategy expert. These Pokemon were chosen as counters to {target_pokemon} ({target_types}).
+    Do not change, add or remove any Pokemon. For each one, rewrite the factual notes into one engaging sentence.
+
+    Counters and notes:
+    {counters}
+
+    Format each counter as:
+    Name: [Pokemon Name exactly as given]
+    Reason: [One sentence explanation]
+
+    Separate each Pokemon with a line break.
+    """
+)
+
+team_analysis_prompt = PromptSpec(
     input_variables=["description", "team_members"],
     template="""
     You are a Pokemon team strategy expert. Analyze why this team is well-suited for the user's request.
@@ -209,19 +949,801 @@ team_analysis_prompt = PromptTemplate(
     """
 )
 
+description_batch_prompt = PromptSpec(
+    input_variables=["pokemon"],
+    template="""
+    You are a Pokemon expert. Provide a detailed and engaging description for each of these Pokemon.
+
+    {pokemon}
+
+    For each Pokemon, write a 2-3 sentence description that includes:
+    1. What this Pokemon looks like or represents
+    2. Its key characteristics or personality
+    3. What makes it special in battle or as a companion
+
+    Keep it informative but engaging, suitable for trainers who want to know more about these Pokemon.
+
+    Respond with a JSON object mapping each Pokemon name exactly as given to its description, and nothing else.
+    """
+)
+
+team_prompt = PromptSpec(
+    input_variables=["description"],
+    template="""
+    Generate a Pokemon team of 6 Pokemon based on this description: {description}
+
+    For each Pokemon, provide:
+    - name: [Exact Pokemon name]
+    - type: [Primary type]
+    - role: [Role in team like Attacker, Tank, Support, etc.]
+    - Reason: write why this pokemon was choosen based on stats an team synergy with other pokemons in the team in 50-60 words
+
+    Format each Pokemon as:
+    Name: [Pokemon Name]
+    Type: [Type]
+    Role: [Role]
+    Reason: [Reason]
+
+    Separate each Pokemon with a line break.
+    """
+)
+
+team_repair_prompt = PromptSpec(
+    input_variables=["description", "team_members", "invalid_names", "count"],
+    template="""
+    A Pokemon team is being built for this description: {description}
+
+    These team members are already chosen: {team_members}
+
+    These suggestions are not real Pokemon (or are duplicates) and must be replaced: {invalid_names}
+
+    Suggest exactly {count} different, real Pokemon to complete the team, using their exact official names.
+
+    Format each Pokemon as:
+    Name: [Pokemon Name]
+    Type: [Type]
+    Role: [Role]
+    Reason: [Reason in 50-60 words]
+
+    Separate each Pokemon with a line break.
+    """
+)
+
 # --- LLM Chains ---
-description_chain = LLMChain(llm=llm, prompt=description_prompt)
-battle_chain = LLMChain(llm=llm, prompt=battle_prompt)
-counter_chain = LLMChain(llm=llm, prompt=counter_prompt)
-team_analysis_chain = LLMChain(llm=llm, prompt=team_analysis_prompt)
+CHAIN_PROMPTS = {
+    "description": description_prompt,
+    "description_batch": description_batch_prompt,
+    "battle": battle_prompt,
+    "counter": counter_prompt,
+    "team": team_prompt,
+    "team_repair": team_repair_prompt,
+    "team_analysis": team_analysis_prompt,
+    "counter_reason": counter_reason_prompt
+}
+
+
+LLM_STACK_RETRY_INTERVAL = 60  # Seconds to answer 503 before retrying a failed build
+
+
+class LLMStack:
+    """The LLM and its chains, built once on first use or by the startup warmup
+
+    Importing LangChain and the Gemini client takes over a second, so nothing is imported
+    until an LLM-backed request (or the warmup) needs it. Building runs on an executor
+    thread; concurrent first callers wait on the same lock. A failed build is remembered
+    for LLM_STACK_RETRY_INTERVAL so callers get an immediate 503 instead of rebuilding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chains: Optional[Dict[str, Any]] = None
+        self.build_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._failed_at = float("-inf")
+
+    @property
+    def ready(self) -> bool:
+        return self._chains is not None
+
+    def warm(self):
+        """Build the stack ahead of the first LLM-backed request; a failure is retried after the retry interval"""
+        try:
+            self.chain("description")
+        except HTTPException:
+            pass  # Already logged by _build
+
+    def check_available(self):
+        """Raise 503 without building while the backend is known to be unusable"""
+        if self._chains is not None:
+            return
+        if LLM_BACKEND == "gemini" and not os.getenv("GEMINI_API_KEY"):
+            self.error = "GEMINI_API_KEY is not set"
+        elif time.monotonic() - self._failed_at >= LLM_STACK_RETRY_INTERVAL:
+            return
+        raise HTTPException(
+            status_code=503,
+            detail=f"AI backend unavailable: {self.error}",
+            headers={"Retry-After": str(LLM_STACK_RETRY_INTERVAL)}
+        )
+
+    def chain(self, chain_name: str) -> Any:
+        if self._chains is None:
+            self._build()
+        return self._chains[chain_name]
+
+    def _build(self):
+        self.check_available()
+        with self._lock:
+            if self._chains is not None:
+                return
+            # Callers queued on the lock behind a failed build fail with it instead of retrying
+            self.check_available()
+            started = time.perf_counter()
+            try:
+                from langchain.chains import LLMChain
+                from langchain_core.prompts import PromptTemplate
+                from llm_backends import create_llm
+
+                llm = create_llm(LLM_BACKEND, LLM_MODEL, LLM_TEMPERATURE)
+                chains = {
+                    name: LLMChain(
+                        llm=llm,
+                        prompt=PromptTemplate(input_variables=spec.input_variables, template=spec.template)
+                    )
+                    for name, spec in CHAIN_PROMPTS.items()
+                }
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self._failed_at = time.monotonic()
+                logger.error(
+                    f"Failed to initialize the {LLM_BACKEND} LLM backend, retrying in "
+                    f"{LLM_STACK_RETRY_INTERVAL}s: {self.error}"
+                )
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"AI backend unavailable: {self.error}",
+                    headers={"Retry-After": str(LLM_STACK_RETRY_INTERVAL)}
+                )
+            self.build_seconds = time.perf_counter() - started
+            self.error = None
+            self._chains = chains
+            startup_seconds.set(self.build_seconds, "llm_stack")
+            logger.info(f"Initialized {LLM_BACKEND} LLM stack in {self.build_seconds:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": LLM_BACKEND,
+            "model": LLM_MODEL,
+            "ready": self.ready,
+            "build_seconds": round(self.build_seconds, 3) if self.build_seconds is not None else None,
+            "error": self.error
+        }
+
+
+llm_stack = LLMStack()
+
+# --- LLM Response Cache ---
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")  # Empty disables the cache
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_TOUCH_INTERVAL = 3600  # Seconds between last_access updates for one entry
+
+
+class LLMResponseCache(SQLiteDatabase):
+    """Persistent exact-match cache of LLM completions keyed by prompt, model and temperature"""
+
+    def __init__(self, path: str, max_bytes: int):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    chain TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float) -> str:
+        return hashlib.sha256(f"{model}\0{temperature}\0{prompt}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute("SELECT response, last_access FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        now = time.time()
+        # Coarse LRU: only rewrite last_access occasionally so hits stay read-only
+        if now - row[1] > LLM_CACHE_TOUCH_INTERVAL:
+            with conn:
+                conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, chain: str, response: str):
+        """Store a completion and evict least recently used entries beyond max_bytes"""
+        now = time.time()
+        size = len(response.encode())
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, chain, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, chain, response, size, now, now)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Trim to 90% so eviction does not run on every insert
+                excess = total - int(self.max_bytes * 0.9)
+                victims = []
+                for victim_key, victim_size in conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_access"
+                ):
+                    if excess <= 0:
+                        break
+                    victims.append((victim_key,))
+                    excess -= victim_size
+                conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+                self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Opened in lifespan, so importing the module never creates database files
+llm_cache: Optional[LLMResponseCache] = None
+LLM_SHARED_NAMESPACE = "llm:"  # Completions never expire; the shared table evicts them when full
+DESCRIPTION_CACHE_SIZE = int(os.getenv("DESCRIPTION_CACHE_SIZE", "1024"))
+# Always-on in-process tier for descriptions, in front of the shared and SQLite caches, so one
+# completion serves every repeat request and its If-None-Match revalidation in this worker
+description_cache = AsyncTTLCache(maxsize=DESCRIPTION_CACHE_SIZE, ttl=float("inf"), shared=shared_cache,
+                                  namespace=LLM_SHARED_NAMESPACE)
+
+# --- LLM Executor ---
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+# Adaptive rate limit: unthrottled until the first quota error, then half the observed call rate,
+# climbing by LLM_RATE_INCREASE per successful call. LLM_RATE_LIMIT is an optional hard ceiling (0 = none).
+LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", "0"))
+LLM_RATE_MIN = float(os.getenv("LLM_RATE_MIN", "0.2"))
+LLM_RATE_INCREASE = float(os.getenv("LLM_RATE_INCREASE", "0.1"))
+LLM_RATE_DECREASE = 0.5
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+LLM_RATE_LIMIT_BACKOFF = 2.0  # Seconds to pause after a quota error that carries no retry hint
+
+# LLM call priorities; lower runs first. Bulk endpoints set llm_priority for the calls they make.
+INTERACTIVE, BULK = 0, 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+llm_priority: ContextVar[int] = ContextVar("llm_priority", default=INTERACTIVE)
+
+RETRY_HINTS = (
+    re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE),
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"retry-after:?\s*([\d.]+)", re.IGNORECASE)
+)
+RATE_LIMIT_TYPES = ("ResourceExhausted", "TooManyRequests", "RateLimitError")
+# Only for wrappers that keep nothing but the message, e.g. "429 Resource has been exhausted" or "Error code: 429"
+RATE_LIMIT_MESSAGE = re.compile(
+    r"(?:^|\b(?:status|code|error)\W{0,3})429\b|resource[ _]has[ _]been[ _]exhausted|\bresource_exhausted\b",
+    re.IGNORECASE
+)
+
+
+def exception_chain(error: BaseException):
+    """error and the exceptions it was raised from, outermost first"""
+    while error is not None:
+        yield error
+        error = error.__cause__
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether error, or an exception it wraps, is a 429; the type and status code decide before the message"""
+    for cause in exception_chain(error):
+        if type(cause).__name__ in RATE_LIMIT_TYPES:
+            return True
+        code = getattr(cause, "code", None)
+        if not isinstance(code, int):
+            code = getattr(cause, "status_code", None)
+        if isinstance(code, int) and not isinstance(code, bool):
+            return code == 429
+    return any(RATE_LIMIT_MESSAGE.search(str(cause)) for cause in exception_chain(error))
+
+
+def rate_limit_delay(error: BaseException) -> Optional[float]:
+    """Seconds the backend asked us to wait if error is a 429/quota error (0.0 without a hint), else None"""
+    if not is_rate_limited(error):
+        return None
+    for cause in exception_chain(error):
+        response = getattr(cause, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        text = str(cause)
+        for pattern in RETRY_HINTS:
+            match = pattern.search(text)
+            if match:
+                return float(match.group(1))
+    return 0.0
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate follows AIMD: additive increase on success, multiplicative decrease on 429
+
+    The rate starts at max_rate, which is unlimited when 0, so nothing is throttled until the
+    backend pushes back. The first decrease from unlimited halves the rate calls actually
+    started at over the last second; additive increase then probes upwards with no ceiling
+    other than max_rate.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float, increase: float, decrease: float):
+        self.max_rate = max_rate if max_rate > 0 else math.inf
+        self.min_rate = min(min_rate, self.max_rate)
+        self.rate = self.max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self._starts: deque = deque()  # Start times within the last second
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")
+        self.throttled = 0
+
+    def delay(self) -> float:
+        """Seconds until the next call may start; 0 when a token is available now"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if math.isinf(self.rate):
+            return 0.0
+        # Up to one second of calls may start back to back
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        now = time.monotonic()
+        self._starts.append(now)
+        while self._starts[0] <= now - 1.0:
+            self._starts.popleft()
+        self.tokens -= 1
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self, retry_after: float):
+        now = time.monotonic()
+        self.throttled += 1
+        # Calls already in flight fail together; count one burst of 429s as one decrease
+        if now - self.decreased_at >= 1.0:
+            observed = sum(1 for started in self._starts if started > now - 1.0)
+            current = self.rate if not math.isinf(self.rate) else max(1.0, observed)
+            self.rate = max(self.min_rate, current * self.decrease)
+            self.decreased_at = now
+        self.tokens = min(self.tokens, 0.0)
+        self.paused_until = max(self.paused_until, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_second": round(self.rate, 3) if not math.isinf(self.rate) else None,
+            "max_rate_per_second": self.max_rate if not math.isinf(self.max_rate) else None,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "throttled": self.throttled
+        }
+
+
+class LLMRateLimited(HTTPException):
+    """Still rate limited after LLM_RATE_LIMIT_RETRIES retries"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail="AI backend is rate limited, please retry shortly",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+
+class LLMExecutor:
+    """Runs blocking LLM chain calls on a bounded thread pool, shedding load when full
+
+    Calls start in priority order as threads and rate-limit tokens free up. A call that hits a
+    quota error slows the limiter down, pauses every call for the backend's retry hint and is
+    queued again; after LLM_RATE_LIMIT_RETRIES it fails with 503 and Retry-After.
+    """
+
+    def __init__(self, max_inflight: int, max_queue: int, limiter: AdaptiveRateLimiter):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.limiter = limiter
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._waiters: List[tuple] = []  # Heap of (priority, sequence, future)
+        self._sequence = itertools.count()
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self.running = 0  # Calls holding a pool thread, until the thread finishes
+        self.completed = 0
+        self.rejected = 0
+        self.retried = 0
+        self.exhausted = 0
+
+    def _admit(self, chain_name: str):
+        pending = self.running + self.queued()
+        if pending >= self.max_inflight + self.max_queue:
+            self.rejected += 1
+            logger.warning(f"Shedding {chain_name} LLM call: {pending} calls pending")
+            raise HTTPException(
+                status_code=503,
+                detail="AI analysis is at capacity, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+    async def _acquire(self, priority: int):
+        """Wait for a thread and a rate-limit token, behind every call of higher priority"""
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Granted just as the caller went away
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            llm_queue_wait.observe(waited, PRIORITY_NAMES.get(priority, str(priority)))
+            record_span("llm_queue", started, waited)
+
+    def _release(self):
+        self.running -= 1
+        self._dispatch()
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, fn: Callable[..., Any], *args) -> asyncio.Future:
+        """Run fn on a granted slot; the slot is released when the thread finishes, even if the caller left"""
+        if self._pool is None:
+            # Used outside the app lifespan (scripts, tests)
+            self.start()
+        future = self._pool.submit(fn, *args)
+
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        future.add_done_callback(release)
+        return asyncio.wrap_future(future, loop=loop)
+
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _dispatch(self):
+        """Start waiting calls in priority order while threads and tokens are available"""
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        while self._waiters and self.running < self.max_inflight:
+            if self._waiters[0][-1].done():
+                heapq.heappop(self._waiters)  # Caller cancelled
+                continue
+            delay = self.limiter.delay()
+            if delay > 0:
+                self._wake_handle = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            self.limiter.take()
+            self.running += 1
+            heapq.heappop(self._waiters)[-1].set_result(None)
+
+    def _rate_limited(self, chain_name: str, retry_after: float):
+        self.retried += 1
+        llm_throttled.inc(chain_name)
+        self.limiter.on_rate_limited(retry_after or LLM_RATE_LIMIT_BACKOFF)
+        logger.warning(f"{chain_name} LLM call rate limited; now {self.limiter.rate:.2f} calls/s")
+
+    def _give_up(self, retry_after: float) -> LLMRateLimited:
+        self.exhausted += 1
+        return LLMRateLimited(retry_after or LLM_RATE_LIMIT_BACKOFF)
+
+    async def run(self, chain_name: str, priority: Optional[int] = None, **inputs) -> str:
+        """Run the named chain in the pool; 503 immediately if the queue is full or the backend is down"""
+        llm_stack.check_available()
+        self._admit(chain_name)
+        priority = llm_priority.get() if priority is None else priority
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            retry_after = 0.0
+            for _ in range(LLM_RATE_LIMIT_RETRIES + 1):
+                await self._acquire(priority)
+                try:
+                    result = await self._submit(loop, self._run_chain, chain_name, inputs)
+                except Exception as e:
+                    retry_after = rate_limit_delay(e)
+                    if retry_after is None:
+                        raise
+                    self._rate_limited(chain_name, retry_after)
+                    continue
+                self.limiter.on_success()
+                return result
+            raise self._give_up(retry_after)
+        except Exception as e:
+            llm_errors.inc(chain_name, type(e).__name__)
+            raise
+        finally:
+            self.completed += 1
+            self._observe(chain_name, started)
+
+    @staticmethod
+    def _run_chain(chain_name: str, inputs: Dict[str, Any]) -> str:
+        return llm_stack.chain(chain_name).run(**inputs)
+
+    async def stream(self, chain_name: str, priority: Optional[int] = None, **inputs) -> AsyncIterator[str]:
+        """Yield completion chunks as the LLM produces them, under the same concurrency bound
+
+        A quota error is retried only if it arrives before the first chunk.
+        """
+        llm_stack.check_available()
+        self._admit(chain_name)
+        priority = llm_priority.get() if priority is None else priority
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        finished = object()
+
+        def produce(queue: asyncio.Queue, stop: threading.Event):
+            def emit(item: Any):
+                try:
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+                except RuntimeError:
+                    stop.set()  # Event loop already closed
+
+            try:
+                chain = llm_stack.chain(chain_name)
+                for chunk in chain.llm.stream(chain.prompt.format(**inputs)):
+                    if stop.is_set():
+                        return
+                    emit(chunk)
+                emit(finished)
+            except Exception as e:
+                emit(e)
+
+        try:
+            retry_after = 0.0
+            for _ in range(LLM_RATE_LIMIT_RETRIES + 1):
+                await self._acquire(priority)
+                queue: asyncio.Queue = asyncio.Queue()
+                stop = threading.Event()
+                # The slot is held until the worker thread exits, even if the consumer leaves first
+                self._submit(loop, produce, queue, stop)
+                yielded = False
+                try:
+                    while True:
+                        item = await queue.get()
+                        if item is finished:
+                            self.limiter.on_success()
+                            return
+                        if isinstance(item, Exception):
+                            retry_after = rate_limit_delay(item)
+                            if retry_after is None or yielded:
+                                raise item
+                            self._rate_limited(chain_name, retry_after)
+                            break
+                        yielded = True
+                        yield item
+                finally:
+                    # Consumer finished or went away; let the worker thread stop at the next chunk
+                    stop.set()
+            raise self._give_up(retry_after)
+        except Exception as e:
+            llm_errors.inc(chain_name, type(e).__name__)
+            raise
+        finally:
+            self.completed += 1
+            self._observe(chain_name, started)
+
+    @staticmethod
+    def _observe(chain_name: str, started: float):
+        duration = time.perf_counter() - started
+        llm_request_duration.observe(duration, chain_name)
+        record_span(f"llm.{chain_name}", started, duration)
+
+    def stats(self) -> Dict[str, Any]:
+        queued: Dict[str, int] = {}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                queued[name] = queued.get(name, 0) + 1
+        return {
+            "in_flight": self.running,
+            "queued": self.queued(),
+            "queued_by_priority": queued,
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rate_limit_retries": self.retried,
+            "rate_limit_exhausted": self.exhausted,
+            "rate_limiter": self.limiter.stats()
+        }
+
+    def start(self):
+        """Open the thread pool (called from the app lifespan, so each lifespan gets a fresh one)"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="llm")
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+llm_executor = LLMExecutor(
+    LLM_MAX_INFLIGHT, LLM_MAX_QUEUE,
+    AdaptiveRateLimiter(LLM_RATE_LIMIT, LLM_RATE_MIN, LLM_RATE_INCREASE, LLM_RATE_DECREASE)
+)
+
+# --- Description Micro-Batching ---
+LLM_BATCH_WINDOW = float(os.getenv("LLM_BATCH_WINDOW_MS", "20")) / 1000  # 0 disables batching
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """The JSON object in an LLM response, tolerating code fences and surrounding prose"""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object in LLM response")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return data
+
+
+class DescriptionBatcher:
+    """Merges description prompts arriving within a short window into one JSON-structured LLM call
+
+    Descriptions missing from the batched answer are retried one by one; if the batched call
+    itself fails, every waiting caller gets the error and uses its usual fallback.
+    """
+
+    def __init__(self, window: float, max_size: int):
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[tuple] = []  # (inputs, future, priority)
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.batched_prompts = 0
+        self.single_calls = 0
+        self.retried = 0
+
+    async def describe(self, inputs: Dict[str, Any]) -> str:
+        if self.window <= 0:
+            self.single_calls += 1
+            return await llm_executor.run("description", **inputs)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((inputs, future, llm_priority.get()))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[tuple]):
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for inputs, _, _ in batch:
+            by_name.setdefault(inputs["name"], inputs)
+        # The merged call is as urgent as its most urgent caller
+        priority = min(entry[2] for entry in batch)
+
+        try:
+            if len(by_name) == 1:
+                self.single_calls += 1
+                inputs = next(iter(by_name.values()))
+                descriptions = {inputs["name"]: await llm_executor.run("description", priority, **inputs)}
+            else:
+                self.batches += 1
+                self.batched_prompts += len(by_name)
+                descriptions = await self._run_batch(list(by_name.values()), priority)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        missing = [inputs for name, inputs in by_name.items() if not descriptions.get(name)]
+        if missing:
+            self.retried += len(missing)
+            retried = await asyncio.gather(
+                *(llm_executor.run("description", priority, **inputs) for inputs in missing),
+                return_exceptions=True
+            )
+            descriptions.update((inputs["name"], result) for inputs, result in zip(missing, retried))
+
+        for inputs, future, _ in batch:
+            if future.done():
+                continue  # Caller went away
+            result = descriptions[inputs["name"]]
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    async def _run_batch(batch: List[Dict[str, Any]], priority: int) -> Dict[str, str]:
+        pokemon = "\n\n".join(
+            f"- Name: {inputs['name']}\n  Types: {inputs['types']}\n"
+            f"  Abilities: {inputs['abilities']}\n  Base Stats: {inputs['stats']}"
+            for inputs in batch
+        )
+        response = await llm_executor.run("description_batch", priority, pokemon=pokemon)
+        try:
+            parsed = parse_json_object(response)
+        except ValueError as e:
+            logger.warning(f"Unparseable batched description response, retrying individually: {e}")
+            return {}
+        return {name: str(text).strip() for name, text in parsed.items() if isinstance(text, str)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "batches": self.batches,
+            "batched_prompts": self.batched_prompts,
+            "single_calls": self.single_calls,
+            "retried_individually": self.retried
+        }
+
+
+description_batcher = DescriptionBatcher(LLM_BATCH_WINDOW, LLM_BATCH_MAX_SIZE)
 
 
 # Enhanced Data Abstraction Layer 
+def fallback_description(base_data: PokemonData) -> str:
+    """Placeholder served when the AI description cannot be generated"""
+    return f"{base_data.name} is a {'/'.join(base_data.types)} type Pokemon."
+
+
 class PokemonDataAbstractor:
     """Abstracts and enriches PokeAPI data for AI agents"""
 
     @staticmethod
-    async def fetch_enhanced_pokemon_data(name: str, include_description: bool = True) -> PokemonData:
+    async def fetch_enhanced_pokemon_data(name: str, include_description: bool = True,
+                                          refresh_description: bool = False) -> PokemonData:
         """Fetch and enhance Pokemon data with AI-generated description"""
         try:
             #  base data from PokeAPI
@@ -230,23 +1752,82 @@ class PokemonDataAbstractor:
             # AI-generated description if requested
             if include_description:
                 try:
-                    description_response = description_chain.run(
-                        name=base_data.name,
-                        types=", ".join(base_data.types),
-                        abilities=", ".join(base_data.abilities),
-                        stats=base_data.stats
+                    base_data.description = await PokemonDataAbstractor._generate_description(
+                        base_data, refresh_description
                     )
-                    base_data.description = description_response.strip()
                 except Exception as e:
                     logger.warning(f"Failed to generate description for {name}: {e}")
-                    base_data.description = f"{base_data.name} is a {'/'.join(base_data.types)} type Pokemon."
+                    base_data.description = fallback_description(base_data)
 
             return base_data
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch enhanced data for {name}: {e}")
             raise HTTPException(status_code=500, detail=f"Data retrieval failed: {e}")
 
+    @staticmethod
+    async def _generate_description(base_data: PokemonData, refresh: bool = False) -> str:
+        """Generate a description, reusing a cached completion for the identical prompt"""
+        inputs = PokemonDataAbstractor._description_inputs(base_data)
+        cache_key, cached = await PokemonDataAbstractor._cached_description(inputs, refresh)
+        if cached is not None:
+            return cached
+
+        description = (await description_batcher.describe(inputs)).strip()
+        await PokemonDataAbstractor._store_description(cache_key, base_data.name, description)
+        return description
+
+    @staticmethod
+    def _description_inputs(base_data: PokemonData) -> Dict[str, Any]:
+        return {
+            "name": base_data.name,
+            "types": ", ".join(base_data.types),
+            "abilities": ", ".join(base_data.abilities),
+            "stats": base_data.stats
+        }
+
+    @staticmethod
+    async def _cached_description(inputs: Dict[str, Any], refresh: bool = False) -> tuple:
+        """(cache key, cached description or None) for the description prompt
+
+        Checks the in-process tier (backed by the cross-worker shared tier) first, then the
+        SQLite cache, promoting SQLite hits into the faster tiers.
+        """
+        cache_key = LLMResponseCache.make_key(description_prompt.format(**inputs), LLM_CACHE_MODEL, LLM_TEMPERATURE)
+        if refresh:
+            if llm_cache is not None:
+                llm_cache.refreshes += 1
+            return cache_key, None
+        with span("llm_cache"):
+            cached = description_cache.get(cache_key)
+            if cached is None and llm_cache is not None:
+                # Off the event loop: a hit may also write last_access and wait on another writer's lock
+                try:
+                    cached = await asyncio.get_running_loop().run_in_executor(None, llm_cache.get, cache_key)
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to read the LLM cache: {e}")
+                if cached is not None:
+                    description_cache.set(cache_key, cached)
+        if cached is None:
+            description_cache.misses += 1
+        else:
+            description_cache.hits += 1
+        return cache_key, cached
+
+    @staticmethod
+    async def _store_description(cache_key: str, name: str, description: str):
+        description_cache.set(cache_key, description)
+        if llm_cache is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, llm_cache.put, cache_key, "description", description
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache description for {name}: {e}")
+
     @staticmethod
     async def _fetch_base_pokemon_data(name: str) -> PokemonData:
         """Fetch base Pokemon data from PokeAPI"""
@@ -254,40 +1835,67 @@ class PokemonDataAbstractor:
             raise HTTPException(status_code=400, detail="Pokemon name cannot be empty")
 
         pokemon_name = name.lower().strip()
-        url = f"{BASE_URL}pokemon/{pokemon_name}"
 
-        try:
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            data = response.json()
-
-            return PokemonData(
-                name=data["name"].capitalize(),
-                id=data["id"],
-                height=data["height"] / 10,  # Convert to meters
-                weight=data["weight"] / 10,  # Convert to kg
-                abilities=[
-                    ability["ability"]["name"].replace("-", " ").title()
-                    for ability in data["abilities"]
-                ],
-                types=[
-                    pok_type["type"]["name"].capitalize()
-                    for pok_type in data["types"]
-                ],
-                stats={
-                    stat["stat"]["name"].replace("-", " ").title(): stat["base_stat"]
-                    for stat in data["stats"]
-                },
-                sprite=data["sprites"]["front_default"]
-            )
+        # Resolve aliases and typos locally instead of paying a PokeAPI round trip for a 404
+        index = await get_name_index()
+        if index is not None:
+            resolved = index.resolve(pokemon_name)
+            if resolved is None:
+                suggestions = index.suggest(pokemon_name)
+                hint = f". Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+                raise HTTPException(status_code=404, detail=f"Pokemon '{name}' not found{hint}")
+            pokemon_name = resolved
+
+        if pokedex_snapshot is not None:
+            record = pokedex_snapshot.get(pokemon_name)
+            if record is not None:
+                return PokemonData(**record)
+        if POKEMON_DATA_MODE == "offline":
+            raise HTTPException(status_code=404, detail=f"Pokemon '{name}' not found")
+
+        record = await pokemon_cache.get_or_load(
+            pokemon_name,
+            lambda: PokemonDataAbstractor._load_pokemon_record(pokemon_name, name)
+        )
+        return PokemonData(**record)
+
+    @staticmethod
+    async def _load_pokemon_record(pokemon_name: str, name: str) -> Dict[str, Any]:
+        """Load one Pokemon from the local store or PokeAPI and cache it under its name and id"""
+        if pokemon_store is not None:
+            # Local SQLite read, off the event loop so a busy database cannot stall it
+            record = None
+            with span("store"):
+                try:
+                    record = await asyncio.get_running_loop().run_in_executor(None, pokemon_store.get, pokemon_name)
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to read {pokemon_name} from the local store: {e}")
+            if record is not None:
+                pokemon_cache.set(record["name"].lower(), record)
+                pokemon_cache.set(str(record["id"]), record)
+                return record
 
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
+        try:
+            data = await pokeapi_client.get_json(f"pokemon/{pokemon_name}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
                 raise HTTPException(status_code=404, detail=f"Pokemon '{name}' not found")
-            raise HTTPException(status_code=response.status_code, detail=f"PokeAPI error: {e}")
-        except requests.exceptions.RequestException as e:
+            raise HTTPException(status_code=e.response.status_code, detail=f"PokeAPI error: {e}")
+        except httpx.RequestError as e:
             raise HTTPException(status_code=503, detail=f"Network error: {e}")
 
+        record = normalize_pokemon(data)
+        pokemon_cache.set(record["name"].lower(), record)
+        pokemon_cache.set(str(record["id"]), record)
+
+        if pokemon_store is not None:
+            keys = [pokemon_name, record["name"].lower(), str(record["id"])]
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, pokemon_store.put, keys, record, data)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist {pokemon_name} to the local store: {e}")
+        return record
+
 
 # MCP Response Helper 
 def create_mcp_response(success: bool, data: Any, agent_instructions: str = None) -> MCPResponse:
@@ -305,6 +1913,385 @@ def create_mcp_response(success: bool, data: Any, agent_instructions: str = None
     )
 
 
+# Deterministic Battle Scorer
+BATTLE_LEVEL = 50
+BATTLE_MOVE_POWER = 80
+STAB_BONUS = 1.5
+
+
+def _level_stat(base: int, is_hp: bool = False) -> float:
+    """Level 50 stat with perfect IVs and no EVs"""
+    scaled = (2 * base + 31) * BATTLE_LEVEL // 100
+    return scaled + BATTLE_LEVEL + 10 if is_hp else scaled + 5
+
+
+def _turns_to_ko(attacker: PokemonData, defender: PokemonData, chart: TypeChart) -> Dict[str, Any]:
+    """Estimate how many hits the attacker's best STAB move needs to knock out the defender"""
+    attacking_types = [t for t in attacker.types if t.lower() in chart.index] or ["normal"]
+    defending_types = [t for t in defender.types if t.lower() in chart.index] or ["normal"]
+    multiplier = chart.best_multiplier(attacking_types, defending_types)
+
+    physical = _level_stat(attacker.stats.get("Attack", 0)) / _level_stat(defender.stats.get("Defense", 0))
+    special = (_level_stat(attacker.stats.get("Special Attack", 0))
+               / _level_stat(defender.stats.get("Special Defense", 0)))
+    ratio = max(physical, special)
+
+    damage = ((2 * BATTLE_LEVEL / 5 + 2) * BATTLE_MOVE_POWER * ratio / 50 + 2) * STAB_BONUS * multiplier
+    hp = _level_stat(defender.stats.get("Hp", 0), is_hp=True)
+    return {
+        "multiplier": multiplier,
+        "category": "physical" if physical >= special else "special",
+        "turns": float("inf") if damage <= 0 else max(1, int(np.ceil(hp / damage)))
+    }
+
+
+def score_battle(pok1: PokemonData, pok2: PokemonData, chart: TypeChart) -> BattleResult:
+    """Decide a 1v1 from base stats, type multipliers and speed, without an LLM"""
+    attack1 = _turns_to_ko(pok1, pok2, chart)
+    attack2 = _turns_to_ko(pok2, pok1, chart)
+    speed1 = pok1.stats.get("Speed", 0)
+    speed2 = pok2.stats.get("Speed", 0)
+
+    if attack1["turns"] == attack2["turns"] == float("inf"):
+        # Neither can land a hit (e.g. Normal vs Ghost), so moving first decides nothing
+        return BattleResult(
+            winner="Draw",
+            confidence="Low",
+            reasoning=f"Neither {pok1.name} nor {pok2.name} can damage the other with its own-type attacks, "
+                      f"so the battle is a stalemate.",
+            key_factors=[
+                f"Type matchup: {pok1.name} hits for {attack1['multiplier']:g}x, "
+                f"{pok2.name} hits back for {attack2['multiplier']:g}x",
+                f"Speed: {pok1.name} {speed1} vs {pok2.name} {speed2}"
+            ]
+        )
+
+    if attack1["turns"] != attack2["turns"]:
+        pok1_wins = attack1["turns"] < attack2["turns"]
+        decided_by_speed = False
+    else:
+        # Same number of hits needed: whoever moves first lands the last one
+        pok1_wins = speed1 >= speed2
+        decided_by_speed = True
+
+    winner, loser = (pok1, pok2) if pok1_wins else (pok2, pok1)
+    win_attack, lose_attack = (attack1, attack2) if pok1_wins else (attack2, attack1)
+    win_speed, lose_speed = (speed1, speed2) if pok1_wins else (speed2, speed1)
+
+    if decided_by_speed or win_attack["turns"] == float("inf"):
+        confidence = "Low"
+    else:
+        margin = lose_attack["turns"] / win_attack["turns"]
+        confidence = "High" if margin >= 2 else "Medium" if margin >= 1.34 else "Low"
+
+    def describe_attack(attacker: PokemonData, defender: PokemonData, attack: Dict[str, Any]) -> str:
+        if attack["turns"] == float("inf"):
+            return f"{attacker.name} cannot damage {defender.name}"
+        hits = f"{attack['turns']} hit{'s' if attack['turns'] != 1 else ''}"
+        return f"{attacker.name} KOs {defender.name} in {hits} with its {attack['category']} attack"
+
+    key_factors = [
+        f"Type matchup: {winner.name} hits for {win_attack['multiplier']:g}x, "
+        f"{loser.name} hits back for {lose_attack['multiplier']:g}x",
+        f"Damage race: {describe_attack(winner, loser, win_attack)}; {describe_attack(loser, winner, lose_attack)}",
+        f"Speed: {winner.name} {win_speed} vs {loser.name} {lose_speed}"
+    ]
+    reasoning = f"{describe_attack(winner, loser, win_attack)}, while {describe_attack(loser, winner, lose_attack)}."
+    if decided_by_speed:
+        reasoning += f" Both need the same number of hits, so {winner.name} wins by moving first."
+
+    return BattleResult(winner=winner.name, confidence=confidence, reasoning=reasoning, key_factors=key_factors)
+
+
+# Whole-Dex Counter Ranking
+COUNTER_SPEED_WEIGHT = 0.25
+MIN_SCORED_MULTIPLIER = 0.125  # Floor for log2 so immunities score as a strong, finite factor
+
+
+class DexTable:
+    """Column arrays over the whole Pokedex for one-pass NumPy scoring"""
+
+    def __init__(self, records: List[Dict[str, Any]], chart: TypeChart):
+        self.chart = chart
+        self.names = [record["name"] for record in records]
+        self.type_names = [record["types"] for record in records]
+        self.sprites = [record.get("sprite") for record in records]
+        self.ids = np.array([record["id"] for record in records])
+
+        # Extra "no type" row/column: it deals no damage and takes neutral damage
+        n_types = len(chart.types)
+        self.no_type = n_types
+        self.padded = np.ones((n_types + 1, n_types + 1), dtype=np.float32)
+        self.padded[:n_types, :n_types] = chart.matrix
+        self.padded[n_types, :] = 0.0
+
+        type_columns = np.full((len(records), 2), self.no_type, dtype=np.intp)
+        for row, record in enumerate(records):
+            known = [chart.index[t.lower()] for t in record["types"] if t.lower() in chart.index][:2]
+            type_columns[row, :len(known)] = known
+        self.type1 = type_columns[:, 0]
+        self.type2 = type_columns[:, 1]
+
+        def column(stat: str, is_hp: bool = False) -> np.ndarray:
+            base = np.array([record["stats"].get(stat, 0) for record in records], dtype=np.float32)
+            return _level_stat(base, is_hp)
+
+        self.hp = column("Hp", is_hp=True)
+        self.attack = column("Attack")
+        self.defense = column("Defense")
+        self.special_attack = column("Special Attack")
+        self.special_defense = column("Special Defense")
+        self.speed = column("Speed")
+
+    def _type_pair(self, types: List[str]) -> tuple:
+        known = [self.chart.index[t.lower()] for t in types if t.lower() in self.chart.index][:2]
+        known += [self.no_type] * (2 - len(known))
+        return known[0], known[1]
+
+    def rank_counters(self, target: PokemonData, k: int) -> List[Dict[str, Any]]:
+        """Score every species against the target and return the top k with their score components"""
+        t1, t2 = self._type_pair(target.types)
+        m = self.padded
+
+        # Offense: best of the counter's own types against the target's typing
+        offense = np.maximum(m[self.type1, t1] * m[self.type1, t2], m[self.type2, t1] * m[self.type2, t2])
+        # Defense: worst case of the target's STAB types against each counter
+        defense = m[t1, self.type1] * m[t1, self.type2]
+        if t2 != self.no_type:
+            defense = np.maximum(defense, m[t2, self.type1] * m[t2, self.type2])
+
+        # Stat ratio: bulk times damage ratio for the counter vs the same for the target
+        target_hp = _level_stat(target.stats.get("Hp", 0), is_hp=True)
+        target_attack = _level_stat(target.stats.get("Attack", 0))
+        target_defense = _level_stat(target.stats.get("Defense", 0))
+        target_special_attack = _level_stat(target.stats.get("Special Attack", 0))
+        target_special_defense = _level_stat(target.stats.get("Special Defense", 0))
+        target_speed = _level_stat(target.stats.get("Speed", 0))
+
+        counter_ratio = np.maximum(self.attack / target_defense, self.special_attack / target_special_defense)
+        target_ratio = np.maximum(target_attack / self.defense, target_special_attack / self.special_defense)
+        stat_term = np.log((self.hp * counter_ratio) / (target_hp * target_ratio))
+
+        speed_diff = self.speed - target_speed
+        scores = (
+            np.log2(np.maximum(offense, MIN_SCORED_MULTIPLIER))
+            - np.log2(np.maximum(defense, MIN_SCORED_MULTIPLIER))
+            + stat_term
+            + COUNTER_SPEED_WEIGHT * np.sign(speed_diff)
+        )
+        scores[self.ids == target.id] = -np.inf
+
+        k = min(k, len(scores) - 1)
+        top = np.argpartition(-scores, k)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "name": self.names[i],
+                "types": self.type_names[i],
+                "sprite": self.sprites[i],
+                "score": round(float(scores[i]), 3),
+                "offense": float(offense[i]),
+                "defense": float(defense[i]),
+                "stat_term": float(stat_term[i]),
+                "outspeeds": bool(speed_diff[i] > 0)
+            }
+            for i in top
+        ]
+
+
+def describe_counter(counter: Dict[str, Any], target: PokemonData) -> str:
+    """Deterministic one-line reason built from a counter's score components"""
+    notes = []
+    if counter["offense"] > 1:
+        notes.append(f"its STAB hits {target.name} for {counter['offense']:g}x")
+    if counter["defense"] == 0:
+        notes.append(f"it is immune to {target.name}'s STAB attacks")
+    elif counter["defense"] < 1:
+        notes.append(f"it resists {target.name}'s STAB attacks ({counter['defense']:g}x)")
+    if counter["stat_term"] > 0:
+        notes.append("it wins the bulk-versus-damage race on base stats")
+    if counter["outspeeds"]:
+        notes.append(f"it outspeeds {target.name}")
+    if not notes:
+        notes.append(f"it trades evenly with {target.name}")
+    reason = "; ".join(notes)
+    return reason[0].upper() + reason[1:] + "."
+
+
+async def get_dex_table() -> DexTable:
+    """Whole-dex column arrays, built once from the Pokedex snapshot"""
+    return await reference_cache.get_or_load("dex_table", _load_dex_table)
+
+
+async def _load_dex_table() -> DexTable:
+    if pokedex_snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Computed counters need the whole Pokedex; set POKEDEX_SNAPSHOT_PATH (see build_snapshot.py)"
+        )
+    return DexTable(pokedex_snapshot.records, await get_type_chart())
+
+
+def parse_battle_response(battle_response: str) -> BattleResult:
+    """Parse the battle prompt's "Winner/Confidence/Reasoning/Key Factors" lines"""
+    lines = battle_response.strip().split('\n')
+    winner = ""
+    confidence = ""
+    reasoning = ""
+    key_factors = []
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Winner:"):
+            winner = line.split(":", 1)[1].strip()
+        elif line.startswith("Confidence:"):
+            confidence = line.split(":", 1)[1].strip()
+        elif line.startswith("Reasoning:"):
+            reasoning = line.split(":", 1)[1].strip()
+        elif line.startswith("Key Factors:"):
+            factors_text = line.split(":", 1)[1].strip()
+            # Simple parsing - split by common separators
+            key_factors = [f.strip() for f in factors_text.replace("-", "").split(",") if f.strip()]
+
+    return BattleResult(
+        winner=winner or "Unknown",
+        confidence=confidence or "Medium",
+        reasoning=reasoning or "Analysis unavailable",
+        key_factors=key_factors or ["Type matchup", "Stat comparison"]
+    )
+
+
+# Concurrency Helper
+async def gather_or_cancel(*aws: Awaitable[Any]) -> List[Any]:
+    """Run awaitables concurrently; the first failure cancels the rest and is re-raised"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in tasks:
+        if task in done and task.exception() is not None:
+            raise task.exception()
+    return [task.result() for task in tasks]
+
+
+def parse_llm_blocks(response: str, labels: Dict[str, str]) -> List[Dict[str, str]]:
+    """Parse blank-line separated "Label: value" blocks from an LLM response"""
+    blocks = []
+    current = {}
+    for line in response.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            if current:
+                blocks.append(current)
+                current = {}
+            continue
+        for prefix, key in labels.items():
+            if line.startswith(prefix):
+                current[key] = line.split(":", 1)[1].strip()
+                break
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+ENRICHMENT_TIMEOUT = float(os.getenv("ENRICHMENT_TIMEOUT", "3"))
+
+
+async def fetch_optional_pokemon(name: Optional[str]) -> Optional[PokemonData]:
+    """Base data for an LLM-suggested name, or None if it is unknown, failing or too slow"""
+    if not name:
+        return None
+    try:
+        return await asyncio.wait_for(PokemonDataAbstractor._fetch_base_pokemon_data(name), ENRICHMENT_TIMEOUT)
+    except Exception as e:
+        logger.info(f"No PokeAPI data for suggested Pokemon '{name}': {e!r}")
+        return None
+
+
+TEAM_SIZE = 6
+TEAM_LABELS = {"Name:": "name", "Type:": "type", "Role:": "role", "Reason:": "reason"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for usage reporting"""
+    return max(1, len(text) // 4)
+
+
+def find_invalid_team_slots(team: List[Dict[str, str]], index: NameIndex) -> List[int]:
+    """Indexes of members whose name is unknown or repeats an earlier member"""
+    invalid = []
+    seen = set()
+    for slot, member in enumerate(team):
+        resolved = index.resolve(member.get("name", "")) if member.get("name") else None
+        if resolved is None or resolved in seen:
+            invalid.append(slot)
+        else:
+            seen.add(resolved)
+    return invalid
+
+
+async def repair_team(description: str, team: List[Dict[str, str]], max_retries: int) -> Dict[str, Any]:
+    """Re-ask the LLM for just the invalid slots until every name resolves or retries run out
+
+    A failed repair call (e.g. 503 while the LLM is rate limited) stops the retries; the team is
+    kept and the slots still invalid are reported in unresolved/unresolved_slots.
+    """
+    report = {
+        "retries": 0, "replaced_slots": [], "unresolved": [], "unresolved_slots": [], "extra_tokens_estimate": 0
+    }
+    index = await get_name_index()
+    if index is None:
+        # Without the index names are checked during enrichment, as before
+        report["validated"] = False
+        return report
+    report["validated"] = True
+
+    invalid = find_invalid_team_slots(team, index)
+    while invalid and report["retries"] < max_retries:
+        valid_members = ", ".join(team[slot]["name"] for slot in range(len(team)) if slot not in invalid)
+        inputs = {
+            "description": description,
+            "team_members": valid_members or "none yet",
+            "invalid_names": ", ".join(team[slot].get("name") or "(missing)" for slot in invalid),
+            "count": str(len(invalid))
+        }
+        try:
+            response = await llm_executor.run("team_repair", **inputs)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.warning(f"Team repair stopped after {report['retries']} retries: {detail}")
+            report["error"] = detail
+            break
+        report["retries"] += 1
+        report["extra_tokens_estimate"] += (
+            estimate_tokens(team_repair_prompt.format(**inputs)) + estimate_tokens(response)
+        )
+
+        replacements = parse_llm_blocks(response, TEAM_LABELS)
+        if len(replacements) < len(invalid):
+            logger.warning(f"Team repair returned {len(replacements)} of {len(invalid)} requested replacements")
+        for slot, replacement in zip(invalid, replacements):
+            team[slot] = replacement
+            if slot not in report["replaced_slots"]:
+                report["replaced_slots"].append(slot)
+        invalid = find_invalid_team_slots(team, index)
+
+    # Every slot still invalid, including ones the model never answered for
+    report["unresolved_slots"] = invalid
+    report["unresolved"] = [team[slot].get("name") or "(missing)" for slot in invalid]
+    return report
+
+
 #  Enhanced MCP Endpoints 
 
 @app.get("/", summary="MCP Server Information")
@@ -322,10 +2309,15 @@ async def mcp_info():
                 "Strategic comparison analysis"
             ],
             "endpoints": {
-                "pokemon_data": "/pokemon/{name}",
-                "pokemon_comparison": "/compare/{pokemon1}/{pokemon2}",
+                "pokemon_data": "/pokemon/{name}?fields={field1},{field2}&include=description",
+                "pokemon_description": "/pokemon/{name}/description (ETag / If-None-Match)",
+                "pokemon_batch": "POST /pokemon/batch (NDJSON stream)",
+                "pokemon_comparison": "/compare/{pokemon1}/{pokemon2}?fields=...&include=description",
                 "battle_analysis": "/battle/{pokemon1}/{pokemon2}",
-                "counter_suggestions": "/counters/{pokemon_name}"
+                "streaming": "/pokemon/{name}/stream, /battle/{pokemon1}/{pokemon2}/stream (Server-Sent Events)",
+                "counter_suggestions": "/counters/{pokemon_name}",
+                "type_effectiveness": "/types/effectiveness?attacking={type}&defending={type1},{type2}",
+                "name_resolution": "/names/resolve?q={name}"
             }
         },
         agent_instructions="Use these endpoints to access Pokemon data with AI-enhanced features"
@@ -334,75 +2326,269 @@ async def mcp_info():
 
 # Main Endpoints -
 
+POKEMON_FIELDS = list(PokemonData.__annotations__)
+EXPENSIVE_FIELDS = {"description"}  # Need an LLM call; only generated when asked for
+DESCRIPTION_MAX_AGE = int(os.getenv("DESCRIPTION_MAX_AGE", "3600"))
+
+FIELDS_QUERY = Query(None, description=f"Comma separated fields to return: {', '.join(POKEMON_FIELDS)}")
+INCLUDE_QUERY = Query(None, description="Comma separated enrichments to add: description")
+
+
+def parse_projection(fields: Optional[str], include: Optional[str]) -> tuple:
+    """(fields to return or None for all, whether to generate the description)"""
+    requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    extras = {extra.strip() for extra in include.split(",") if extra.strip()} if include else set()
+
+    unknown = [field for field in (requested or []) if field not in POKEMON_FIELDS]
+    unknown += [extra for extra in extras if extra not in EXPENSIVE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(POKEMON_FIELDS)}"
+        )
+
+    include_description = "description" in extras or "description" in (requested or [])
+    if requested is not None:
+        requested = list(dict.fromkeys(requested + sorted(extras)))
+    return requested, include_description
+
+
+def project(pokemon_data: PokemonData, fields: Optional[List[str]]) -> Dict[str, Any]:
+    data = pokemon_data.dict()
+    return data if fields is None else {field: data[field] for field in fields}
+
+
+# --- Conditional GET ---
+# Deterministic payloads are encoded once and kept with their ETag, so repeat requests skip
+# the fetch, .dict() and encoding, and a matching If-None-Match is answered with a bare 304.
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+RESPONSE_MAX_AGE = int(os.getenv("RESPONSE_MAX_AGE", "3600"))  # Cache-Control max-age and server-side TTL
+
+# Entries are {"etag", "body"} so the shared tier can hold them too
+response_cache = AsyncTTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_MAX_AGE, shared=shared_cache,
+                               namespace="response:")
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag from the representation bytes"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def cached_json_response(entry: Dict[str, str], if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": entry["etag"], "Cache-Control": f"public, max-age={RESPONSE_MAX_AGE}"}
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(entry["body"], media_type="application/json", headers=headers)
+
+
+async def conditional_json(key: str, if_none_match: Optional[str], refresh: bool,
+                           build: Callable[[], Awaitable[tuple]]) -> Response:
+    """Serve build()'s (payload, cacheable) from pre-encoded bytes with an ETag
+
+    A cached entry answers without calling build(), so neither PokeAPI nor the LLM is touched.
+    refresh rebuilds and replaces the entry. Uncacheable payloads (e.g. a placeholder
+    description after an LLM failure) are sent with no-store.
+    """
+    if not refresh:
+        entry = response_cache.get(key)
+        if entry is not None:
+            response_cache.hits += 1
+            return cached_json_response(entry, if_none_match)
+    response_cache.misses += 1
+
+    payload, cacheable = await build()
+    with span("encode"):
+        body = json_bytes(payload)
+    if not cacheable:
+        return Response(body, media_type="application/json", headers={"Cache-Control": "no-store"})
+    entry = {"etag": make_etag(body), "body": body.decode("utf-8")}
+    response_cache.set(key, entry)
+    return cached_json_response(entry, if_none_match)
+
+
+def response_key(endpoint: str, names: List[str], projection: Optional[List[str]], include_description: bool) -> str:
+    fields = ",".join(projection) if projection is not None else "*"
+    return f"{endpoint}|{'|'.join(name.lower().strip() for name in names)}|{fields}|{int(include_description)}"
+
+
+def has_real_description(pokemon_data: PokemonData) -> bool:
+    return pokemon_data.description is None or pokemon_data.description != fallback_description(pokemon_data)
+
+
 @app.get("/pokemon/{name}")
-async def get_pokemon_details(name: str):
-    """Get Pokemon details with AI-generated description"""
+async def get_pokemon_details(
+        name: str,
+        fields: Optional[str] = FIELDS_QUERY,
+        include: Optional[str] = INCLUDE_QUERY,
+        refresh: bool = Query(False, description="Regenerate the AI description instead of using the cache"),
+        if_none_match: Optional[str] = Header(None)
+):
+    """Get Pokemon details; the AI description is added with include=description
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when nothing changed.
+    """
+    projection, include_description = parse_projection(fields, include)
+
+    async def build() -> tuple:
+        try:
+            pokemon_data = await PokemonDataAbstractor.fetch_enhanced_pokemon_data(name, include_description, refresh)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return project(pokemon_data, projection), has_real_description(pokemon_data)
+
+    key = response_key("pokemon", [name], projection, include_description)
+    return await conditional_json(key, if_none_match, refresh, build)
+
+
+@app.get("/pokemon/{name}/description")
+async def get_pokemon_description(
+        name: str,
+        refresh: bool = Query(False, description="Regenerate the AI description instead of using the cache"),
+        if_none_match: Optional[str] = Header(None)
+):
+    """AI description as its own cacheable resource, generated on first request"""
+    base_data = await PokemonDataAbstractor._fetch_base_pokemon_data(name)
     try:
-        pokemon_data = await PokemonDataAbstractor.fetch_enhanced_pokemon_data(name, True)
-        return pokemon_data.dict()
-    except HTTPException as e:
-        raise e
+        description = await PokemonDataAbstractor._generate_description(base_data, refresh)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        # Serve the placeholder, but do not let clients cache it in place of the real text
+        logger.warning(f"Failed to generate description for {name}: {e}")
+        description = fallback_description(base_data)
+        return Response(
+            json_bytes({"name": base_data.name, "id": base_data.id, "description": description, "generated": False}),
+            media_type="application/json",
+            headers={"Cache-Control": "no-store"}
+        )
+
+    etag = make_etag(description.encode("utf-8"))
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={DESCRIPTION_MAX_AGE}"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        json_bytes({"name": base_data.name, "id": base_data.id, "description": description, "generated": True}),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "10"))
+
+
+@app.post("/pokemon/batch")
+async def batch_pokemon_lookup(request: BatchLookupRequest):
+    """Look up many Pokemon at once, streaming one NDJSON line per result as it completes"""
+    if not request.names:
+        raise HTTPException(status_code=400, detail="names cannot be empty")
+    if len(request.names) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} names per batch")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def lookup(index: int, query: str) -> Dict[str, Any]:
+        llm_priority.set(BULK)  # Each lookup runs in its own task, so this stays local to it
+        async with semaphore:
+            try:
+                pokemon_data = await PokemonDataAbstractor.fetch_enhanced_pokemon_data(
+                    query, request.include_description
+                )
+                return {"index": index, "query": query, "success": True, "data": pokemon_data.dict()}
+            except HTTPException as e:
+                return {
+                    "index": index,
+                    "query": query,
+                    "success": False,
+                    "error": {"status_code": e.status_code, "detail": e.detail}
+                }
+
+    async def stream():
+        tasks = [asyncio.ensure_future(lookup(i, str(query))) for i, query in enumerate(request.names)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield json_bytes(await next_result) + b"\n"
+        finally:
+            # Client went away mid-stream: stop the remaining lookups
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.get("/compare/{pokemon1_name}/{pokemon2_name}")
-async def compare_pokemon_details(pokemon1_name: str, pokemon2_name: str):
-    """Compare two Pokemon with basic data"""
-    try:
-        pok1_data = await PokemonDataAbstractor.fetch_enhanced_pokemon_data(pokemon1_name, True)
-        pok2_data = await PokemonDataAbstractor.fetch_enhanced_pokemon_data(pokemon2_name, True)
-        return {"pokemon1": pok1_data.dict(), "pokemon2": pok2_data.dict()}
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def compare_pokemon_details(
+        pokemon1_name: str,
+        pokemon2_name: str,
+        fields: Optional[str] = FIELDS_QUERY,
+        include: Optional[str] = INCLUDE_QUERY,
+        refresh: bool = Query(False, description="Regenerate the AI descriptions instead of using the cache"),
+        if_none_match: Optional[str] = Header(None)
+):
+    """Compare two Pokemon with basic data; AI descriptions are added with include=description"""
+    projection, include_description = parse_projection(fields, include)
+
+    async def build() -> tuple:
+        try:
+            pok1_data, pok2_data = await gather_or_cancel(
+                PokemonDataAbstractor.fetch_enhanced_pokemon_data(pokemon1_name, include_description, refresh),
+                PokemonDataAbstractor.fetch_enhanced_pokemon_data(pokemon2_name, include_description, refresh)
+            )
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        payload = {"pokemon1": project(pok1_data, projection), "pokemon2": project(pok2_data, projection)}
+        return payload, has_real_description(pok1_data) and has_real_description(pok2_data)
+
+    key = response_key("compare", [pokemon1_name, pokemon2_name], projection, include_description)
+    return await conditional_json(key, if_none_match, refresh, build)
 
 
 @app.get("/battle/{pokemon1_name}/{pokemon2_name}")
-async def head_to_head_battle(pokemon1_name: str, pokemon2_name: str):
+async def head_to_head_battle(
+        pokemon1_name: str,
+        pokemon2_name: str,
+        mode: Literal["ai", "fast"] = Query(
+            "ai", description="ai: Gemini analysis with prose; fast: deterministic stat and type scorer"
+        )
+):
     """Analyze head-to-head battle between two Pokemon"""
     try:
         # Fetch Pokemon data
-        pok1_data = await PokemonDataAbstractor._fetch_base_pokemon_data(pokemon1_name)
-        pok2_data = await PokemonDataAbstractor._fetch_base_pokemon_data(pokemon2_name)
-
-        # Generate battle analysis
-        battle_response = battle_chain.run(
-            pokemon1_name=pok1_data.name,
-            pokemon1_types=", ".join(pok1_data.types),
-            pokemon1_stats=pok1_data.stats,
-            pokemon2_name=pok2_data.name,
-            pokemon2_types=", ".join(pok2_data.types),
-            pokemon2_stats=pok2_data.stats
+        pok1_data, pok2_data = await gather_or_cancel(
+            PokemonDataAbstractor._fetch_base_pokemon_data(pokemon1_name),
+            PokemonDataAbstractor._fetch_base_pokemon_data(pokemon2_name)
         )
 
-        # Parse the response
-        lines = battle_response.strip().split('\n')
-        winner = ""
-        confidence = ""
-        reasoning = ""
-        key_factors = []
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("Winner:"):
-                winner = line.split(":", 1)[1].strip()
-            elif line.startswith("Confidence:"):
-                confidence = line.split(":", 1)[1].strip()
-            elif line.startswith("Reasoning:"):
-                reasoning = line.split(":", 1)[1].strip()
-            elif line.startswith("Key Factors:"):
-                factors_text = line.split(":", 1)[1].strip()
-                # Simple parsing - split by common separators
-                key_factors = [f.strip() for f in factors_text.replace("-", "").split(",") if f.strip()]
-
-        battle_result = BattleResult(
-            winner=winner or "Unknown",
-            confidence=confidence or "Medium",
-            reasoning=reasoning or "Analysis unavailable",
-            key_factors=key_factors or ["Type matchup", "Stat comparison"]
-        )
+        if mode == "fast":
+            chart = await get_type_chart()
+            with span("score"):
+                battle_result = score_battle(pok1_data, pok2_data, chart)
+        else:
+            # Generate battle analysis
+            battle_response = await llm_executor.run(
+                "battle",
+                pokemon1_name=pok1_data.name,
+                pokemon1_types=", ".join(pok1_data.types),
+                pokemon1_stats=pok1_data.stats,
+                pokemon2_name=pok2_data.name,
+                pokemon2_types=", ".join(pok2_data.types),
+                pokemon2_stats=pok2_data.stats
+            )
+
+            with span("parse"):
+                battle_result = parse_battle_response(battle_response)
 
         return {
             "pokemon1": pok1_data.dict(),
@@ -417,54 +2603,123 @@ async def head_to_head_battle(pokemon1_name: str, pokemon2_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --- Server-Sent Events Streaming ---
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one SSE event; data is JSON encoded so tokens keep their newlines"""
+    return f"event: {event}\ndata: {json_bytes(data).decode()}\n\n"
+
+
+def sse_error(e: Exception) -> str:
+    if isinstance(e, HTTPException):
+        return sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+    return sse_event("error", {"status_code": 500, "detail": str(e)})
+
+
+@app.get("/pokemon/{name}/stream")
+async def stream_pokemon_details(
+        name: str,
+        refresh: bool = Query(False, description="Regenerate the AI description instead of using the cache")
+):
+    """Stream Pokemon details as SSE: pokemon, token..., description, done"""
+    base_data = await PokemonDataAbstractor._fetch_base_pokemon_data(name)
+
+    async def events():
+        yield sse_event("pokemon", base_data.dict())
+
+        inputs = PokemonDataAbstractor._description_inputs(base_data)
+        cache_key, description = await PokemonDataAbstractor._cached_description(inputs, refresh)
+        if description is None:
+            chunks = []
+            try:
+                async for chunk in llm_executor.stream("description", **inputs):
+                    chunks.append(chunk)
+                    yield sse_event("token", chunk)
+                description = "".join(chunks).strip()
+                await PokemonDataAbstractor._store_description(cache_key, base_data.name, description)
+            except Exception as e:
+                logger.warning(f"Failed to stream description for {name}: {e}")
+                description = fallback_description(base_data)
+
+        yield sse_event("description", description)
+        yield sse_event("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.get("/battle/{pokemon1_name}/{pokemon2_name}/stream")
+async def stream_head_to_head_battle(pokemon1_name: str, pokemon2_name: str):
+    """Stream a battle analysis as SSE: pokemon, token..., battle_result, done"""
+    pok1_data, pok2_data = await gather_or_cancel(
+        PokemonDataAbstractor._fetch_base_pokemon_data(pokemon1_name),
+        PokemonDataAbstractor._fetch_base_pokemon_data(pokemon2_name)
+    )
+
+    async def events():
+        yield sse_event("pokemon", {"pokemon1": pok1_data.dict(), "pokemon2": pok2_data.dict()})
+
+        chunks = []
+        try:
+            async for chunk in llm_executor.stream(
+                    "battle",
+                    pokemon1_name=pok1_data.name,
+                    pokemon1_types=", ".join(pok1_data.types),
+                    pokemon1_stats=pok1_data.stats,
+                    pokemon2_name=pok2_data.name,
+                    pokemon2_types=", ".join(pok2_data.types),
+                    pokemon2_stats=pok2_data.stats
+            ):
+                chunks.append(chunk)
+                yield sse_event("token", chunk)
+        except Exception as e:
+            logger.error(f"Battle analysis stream failed: {e}")
+            yield sse_error(e)
+            return
+
+        yield sse_event("battle_result", parse_battle_response("".join(chunks)).dict())
+        yield sse_event("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @app.get("/counters/{pokemon_name}")
-async def suggest_counters(pokemon_name: str):
+async def suggest_counters(
+        pokemon_name: str,
+        mode: Literal["ai", "computed"] = Query(
+            "ai", description="ai: Gemini suggestions; computed: rank the whole Pokedex by type and stat matchup"
+        ),
+        limit: int = Query(4, ge=1, le=20, description="Number of counters to return in computed mode"),
+        phrase: bool = Query(False, description="Computed mode only: have the LLM reword the reasons")
+):
     """Suggest counter Pokemon for the given Pokemon"""
     try:
         # Fetch target Pokemon data
         target_data = await PokemonDataAbstractor._fetch_base_pokemon_data(pokemon_name)
 
+        if mode == "computed":
+            return {
+                "target_pokemon": target_data.dict(),
+                "counters": [counter.dict() for counter in await compute_counters(target_data, limit, phrase)]
+            }
+
         # Generate counter suggestions
-        counter_response = counter_chain.run(
+        counter_response = await llm_executor.run(
+            "counter",
             target_pokemon=target_data.name,
             target_types=", ".join(target_data.types),
             target_stats=target_data.stats
         )
 
-        # Parse the response
-        counters = []
-        current_counter = {}
-
-        for line in counter_response.strip().split('\n'):
-            line = line.strip()
-            if not line:
-                if current_counter:
-                    # Fetch sprite for counter Pokemon
-                    try:
-                        counter_data = await PokemonDataAbstractor._fetch_base_pokemon_data(current_counter["name"])
-                        current_counter["sprite"] = counter_data.sprite
-                    except:
-                        current_counter["sprite"] = None
-
-                    counters.append(CounterPokemon(**current_counter))
-                    current_counter = {}
-                continue
-
-            if line.startswith("Name:"):
-                current_counter["name"] = line.split(":", 1)[1].strip()
-            elif line.startswith("Type:"):
-                current_counter["type"] = line.split(":", 1)[1].strip()
-            elif line.startswith("Reason:"):
-                current_counter["reason"] = line.split(":", 1)[1].strip()
-
-        # Add the last counter if exists
-        if current_counter:
-            try:
-                counter_data = await PokemonDataAbstractor._fetch_base_pokemon_data(current_counter["name"])
-                current_counter["sprite"] = counter_data.sprite
-            except:
-                current_counter["sprite"] = None
-            counters.append(CounterPokemon(**current_counter))
+        # Parse the response, then fetch every counter's sprite at once
+        with span("parse"):
+            counters = parse_llm_blocks(counter_response, {"Name:": "name", "Type:": "type", "Reason:": "reason"})
+        with span("enrich"):
+            counter_data = await asyncio.gather(*(fetch_optional_pokemon(counter.get("name")) for counter in counters))
+        for counter, data in zip(counters, counter_data):
+            counter["sprite"] = data.sprite if data is not None else None
+        counters = [CounterPokemon(**counter) for counter in counters]
 
         return {
             "target_pokemon": target_data.dict(),
@@ -477,85 +2732,88 @@ async def suggest_counters(pokemon_name: str):
         logger.error(f"Counter suggestion failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/team/generate")
-async def generate_team(description: str = Query(..., description="Team description")):
-    """Generate a Pokemon team based on description with AI analysis"""
-    try:
-        # Simple team generation using LLM
-        team_prompt_template = PromptTemplate(
-            input_variables=["description"],
-            template="""
-            Generate a Pokemon team of 6 Pokemon based on this description: {description}
-
-            For each Pokemon, provide:
-            - name: [Exact Pokemon name]
-            - type: [Primary type]
-            - role: [Role in team like Attacker, Tank, Support, etc.]
-            - Reason: write why this pokemon was choosen based on stats an team synergy with other pokemons in the team in 50-60 words
-
-            Format each Pokemon as:
-            Name: [Pokemon Name]
-            Type: [Type]
-            Role: [Role]
-            Reason: [Reason]
-
-            Separate each Pokemon with a line break.
-            """
+async def compute_counters(target_data: PokemonData, limit: int, phrase: bool) -> List[CounterPokemon]:
+    """Top counters from the whole-dex ranking, optionally reworded by the LLM"""
+    dex_table = await get_dex_table()
+    with span("rank"):
+        ranked = dex_table.rank_counters(target_data, limit)
+    reasons = {counter["name"]: describe_counter(counter, target_data) for counter in ranked}
+
+    if phrase:
+        notes = "\n".join(f"- {name}: {reason}" for name, reason in reasons.items())
+        try:
+            phrased = await llm_executor.run(
+                "counter_reason",
+                target_pokemon=target_data.name,
+                target_types=", ".join(target_data.types),
+                counters=notes
+            )
+            for block in parse_llm_blocks(phrased, {"Name:": "name", "Reason:": "reason"}):
+                if block.get("name") in reasons and block.get("reason"):
+                    reasons[block["name"]] = block["reason"]
+        except Exception as e:
+            logger.warning(f"Failed to phrase counter reasons for {target_data.name}: {e}")
+
+    return [
+        CounterPokemon(
+            name=counter["name"],
+            type="/".join(counter["types"]),
+            reason=reasons[counter["name"]],
+            sprite=counter["sprite"],
+            score=counter["score"]
         )
+        for counter in ranked
+    ]
 
-        team_chain = LLMChain(llm=llm, prompt=team_prompt_template)
-        team_response = team_chain.run(description=description)
-
-        # Parse team response
-        team = []
-        current_member = {}
-
-        for line in team_response.strip().split('\n'):
-            line = line.strip()
-            if not line:
-                if current_member:
-                    # Fetch sprite and additional data for team member
-                    try:
-                        member_data = await PokemonDataAbstractor._fetch_base_pokemon_data(current_member["name"])
-                        current_member["sprite"] = member_data.sprite
-                        current_member["stats"] = member_data.stats
-                        current_member["types"] = member_data.types
-                    except:
-                        current_member["sprite"] = None
-                        current_member["stats"] = {}
-                        current_member["types"] = [current_member.get("type", "Unknown")]
-
-                    team.append(current_member)
-                    current_member = {}
-                continue
 
-            if line.startswith("Name:"):
-                current_member["name"] = line.split(":", 1)[1].strip()
-            elif line.startswith("Type:"):
-                current_member["type"] = line.split(":", 1)[1].strip()
-            elif line.startswith("Role:"):
-                current_member["role"] = line.split(":", 1)[1].strip()
-            elif line.startswith("Reason:"):  # ADD THIS LINE
-                current_member["reason"] = line.split(":", 1)[1].strip()
-
-        # Add the last member if exists
-        if current_member:
-            try:
-                member_data = await PokemonDataAbstractor._fetch_base_pokemon_data(current_member["name"])
-                current_member["sprite"] = member_data.sprite
-                current_member["stats"] = member_data.stats
-                current_member["types"] = member_data.types
-            except:
-                current_member["sprite"] = None
-                current_member["stats"] = {}
-                current_member["types"] = [current_member.get("type", "Unknown")]
-            team.append(current_member)
+@app.post("/team/generate")
+async def generate_team(
+        description: Optional[str] = Query(None, description="Team description"),
+        request: Optional[TeamRequest] = Body(None)
+):
+    """Generate a Pokemon team based on description with AI analysis"""
+    if request is None:
+        if not description:
+            raise HTTPException(status_code=400, detail="A team description is required")
+        request = TeamRequest(description=description)
+    description = request.description
+
+    # Team generation is bulk work: its LLM calls queue behind interactive lookups and battles.
+    # Reset afterwards, since an in-process caller (ASGITransport) shares this context.
+    priority_token = llm_priority.set(BULK)
+    try:
+        team_response = await llm_executor.run("team", description=description)
+
+        # Parse team response, check every name locally and re-ask only for the invalid slots
+        with span("parse"):
+            team = parse_llm_blocks(team_response, TEAM_LABELS)[:TEAM_SIZE]
+            team += [{} for _ in range(TEAM_SIZE - len(team))]
+        with span("validate"):
+            validation = await repair_team(description, team, request.max_retries)
+        team = [member for member in team if member.get("name")]
+
+        # Fetch sprites and stats for all members at once
+        if not request.include_stats:
+            team_data = [None] * len(team)
+        else:
+            with span("enrich"):
+                team_data = await asyncio.gather(*(fetch_optional_pokemon(member.get("name")) for member in team))
+        for member, member_data in zip(team, team_data):
+            if member_data is not None:
+                member["sprite"] = member_data.sprite
+                member["stats"] = member_data.stats
+                member["types"] = member_data.types
+            else:
+                member["sprite"] = None
+                member["stats"] = {}
+                member["types"] = [member.get("type", "Unknown")]
 
         # Generate team analysis
-        team_members_str = ", ".join([f"{member['name']} ({member['role']})" for member in team])
+        team_members_str = ", ".join([f"{member['name']} ({member.get('role', 'Member')})" for member in team])
 
         try:
-            analysis = team_analysis_chain.run(
+            analysis = await llm_executor.run(
+                "team_analysis",
                 description=description,
                 team_members=team_members_str
             )
@@ -566,25 +2824,155 @@ async def generate_team(description: str = Query(..., description="Team descript
         return {
             "team": team,
             "analysis": analysis,
-            "description": description
+            "description": description,
+            "metadata": {"validation": validation}
         }
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Team generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        llm_priority.reset(priority_token)
     
 
+@app.get("/names/resolve", summary="Resolve a Pokemon Name")
+async def resolve_pokemon_name(q: str = Query(..., description="Name, alias or misspelling to resolve")):
+    """Resolve a name to its PokeAPI slug locally, with "did you mean" suggestions"""
+    index = await get_name_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Name index is not available yet")
+    resolved = index.resolve(q)
+    return {
+        "query": q,
+        "resolved": resolved,
+        "suggestions": [] if resolved is not None else index.suggest(q)
+    }
+
+
+@app.get("/types/effectiveness", summary="Type Effectiveness")
+async def type_effectiveness(
+        attacking: Optional[str] = Query(None, description="Attacking type, e.g. fire"),
+        defending: Optional[str] = Query(None, description="One or two defending types, comma separated, e.g. grass,steel")
+):
+    """Deterministic type matchups from the type chart, without an LLM round trip"""
+    chart = await get_type_chart()
+    defending_types = [t for t in defending.split(",") if t.strip()] if defending else []
+    if len(defending_types) > 2:
+        raise HTTPException(status_code=400, detail="At most two defending types are allowed")
+    if len({t.strip().lower() for t in defending_types}) < len(defending_types):
+        # A Pokemon never has the same type twice; counting it twice would square the multiplier
+        raise HTTPException(status_code=400, detail="Defending types must be different")
+
+    try:
+        if attacking and defending_types:
+            return {
+                "attacking": attacking.lower(),
+                "defending": [t.strip().lower() for t in defending_types],
+                "multiplier": chart.multiplier(attacking, defending_types)
+            }
+
+        if defending_types:
+            profile = chart.defending_profile(defending_types)
+            multipliers = {t: float(m) for t, m in zip(chart.types, profile)}
+            return {
+                "defending": [t.strip().lower() for t in defending_types],
+                "multipliers": multipliers,
+                "weaknesses": [t for t, m in multipliers.items() if m > 1],
+                "resistances": [t for t, m in multipliers.items() if 0 < m < 1],
+                "immunities": [t for t, m in multipliers.items() if m == 0]
+            }
+
+        if attacking:
+            row = chart.matrix[chart.indices([attacking])[0]]
+            return {
+                "attacking": attacking.lower(),
+                "multipliers": {t: float(m) for t, m in zip(chart.types, row)}
+            }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"types": chart.types, "matrix": chart.matrix.tolist()}
+
+
+@app.get("/cache/stats", summary="Cache Statistics")
+async def cache_stats():
+    """Hit, miss and eviction counters for sizing the in-process caches"""
+    return create_mcp_response(
+        success=True,
+        data={
+            "pokemon": pokemon_cache.stats(),
+            "responses": response_cache.stats(),
+            "descriptions": description_cache.stats(),
+            "pokemon_store": pokemon_store.stats() if pokemon_store is not None else None,
+            "llm": llm_cache.stats() if llm_cache is not None else None,
+            "shared": shared_cache.stats() if shared_cache is not None else None
+        },
+        agent_instructions="Operational metrics; not Pokemon data"
+    )
+
+
+def collect_component_metrics():
+    """Copy cache, executor and connection counters into the registry before a scrape"""
+    caches = {"pokemon": pokemon_cache, "reference": reference_cache, "response": response_cache,
+              "description": description_cache}
+    for name, cache in caches.items():
+        cache_hits.set(cache.hits + cache.coalesced, name)
+        cache_misses.set(cache.misses, name)
+    if llm_cache is not None:
+        cache_hits.set(llm_cache.hits, "llm")
+        cache_misses.set(llm_cache.misses, "llm")
+    if shared_cache is not None:
+        cache_hits.set(shared_cache.hits, "shared")
+        cache_misses.set(shared_cache.misses, "shared")
+    for labels, hits in cache_hits.values.items():
+        lookups = hits + cache_misses.values.get(labels, 0)
+        cache_hit_ratio.set(hits / lookups if lookups else 0.0, *labels)
+
+    executor = llm_executor.stats()
+    llm_in_flight.set(executor["in_flight"])
+    llm_queued.set(executor["queued"])
+    llm_rejected.set(executor["rejected"])
+    llm_rate.set(llm_executor.limiter.rate)
+    llm_batched_prompts.set(description_batcher.batched_prompts)
+    pokeapi_in_flight.set(pokeapi_client.in_flight)
+
+
+metrics.add_collector(collect_component_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # --- Health Check ---
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return create_mcp_response(
         success=True,
-        data={"status": "healthy", "services": ["PokeAPI", "Gemini AI", "LLM Chains"]},
+        data={
+            "status": "healthy",
+            "services": ["PokeAPI", "Gemini AI", "LLM Chains"],
+            "data_mode": POKEMON_DATA_MODE,
+            "llm_backend": LLM_BACKEND,
+            "llm_stack": llm_stack.stats(),
+            "startup": {phase: round(seconds, 3) for (phase,), seconds in startup_seconds.values.items()},
+            "llm_executor": llm_executor.stats(),
+            "description_batcher": description_batcher.stats(),
+            "snapshot": pokedex_snapshot.info() if pokedex_snapshot is not None else None
+        },
         agent_instructions="All systems operational"
     )
 
 
+startup_seconds.set(_libraries_imported - _import_started, "libraries")
+startup_seconds.set(time.perf_counter() - _import_started, "import")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,182 @@
+"""LLM backends for the MCP server's chains: Gemini, a deterministic stub, and recorded replay
+
+Every backend is a LangChain LLM exposing `model` and `temperature`, which the
+server uses in its response-cache keys. Select one with LLM_BACKEND:
+
+    gemini  GoogleGenerativeAI (default); LLM_RECORD_PATH also appends every completion to a recording
+    stub    Deterministic canned completions after LLM_STUB_LATENCY seconds; no API key or network.
+            LLM_STUB_RATE_LIMIT (calls/second) makes it answer excess calls with a quota error
+    replay  Completions from an LLM_RECORD_PATH recording; unrecorded prompts raise LookupError
+"""
+from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+from langchain_core.language_models.llms import LLM
+
+LLM_BACKENDS = ("gemini", "stub", "replay")
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def stub_completion(prompt: str, names: List[str]) -> str:
+    """Deterministic completion for each of the server's prompts, chosen by prompt wording"""
+    rng = random.Random(zlib.crc32(prompt.encode()))
+
+    def blocks(count: int, labels: tuple) -> str:
+        picks = rng.sample(names, min(count, len(names)))
+        return "\n\n".join(
+            "\n".join(f"{label}: {pick if label == 'Name' else 'Stub ' + label.lower()}" for label in labels)
+            for pick in picks
+        )
+
+    if "Respond with a JSON object" in prompt:
+        # Batched descriptions: one entry per "- Name:" line
+        batch = re.findall(r"^\s*- Name: (.+)$", prompt, flags=re.MULTILINE)
+        return json.dumps({name.strip(): f"A stub description of {name.strip()}." for name in batch})
+    if "Generate a Pokemon team" in prompt:
+        return blocks(6, ("Name", "Type", "Role", "Reason"))
+    if "must be replaced" in prompt:
+        count = int(prompt.split("Suggest exactly ", 1)[1].split()[0])
+        return blocks(count, ("Name", "Type", "Role", "Reason"))
+    if "were chosen as counters" in prompt:
+        chosen = [
+            line.split(":", 1)[0].lstrip("- ").strip()
+            for line in prompt.splitlines() if line.strip().startswith("- ")
+        ]
+        return "\n\n".join(f"Name: {name}\nReason: Stub reason." for name in chosen)
+    if "effective counters against" in prompt:
+        return blocks(3, ("Name", "Type", "Reason"))
+    if "head-to-head matchup" in prompt:
+        winner = prompt.split("Pokemon 1:", 1)[1].splitlines()[0].strip()
+        return (f"Winner: {winner}\nConfidence: Medium\n"
+                f"Reasoning: {winner} has the better stat spread in this stub analysis.\n"
+                "Key Factors: Speed, Type matchup")
+    if "Analyze why this team" in prompt:
+        return "This stub team covers its weaknesses well."
+    name = re.search(r"description for (.+?)\.\s", prompt)
+    return f"A stub description of {name.group(1) if name else 'this Pokemon'}."
+
+
+class StubRateLimitError(Exception):
+    """Quota error in the shape Gemini reports it, raised by StubLLM above its rate limit"""
+    code = 429
+
+
+class StubLLM(LLM):
+    """Fixed-latency LLM returning deterministic completions, for tests and benchmarks"""
+    model: str = "stub"
+    temperature: float = 0.0
+    latency: float = 0.0
+    rate_limit: float = 0.0  # Calls per second; 0 is unlimited
+    names: List[str] = []
+    call_times: List[float] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> str:
+        if self.rate_limit:
+            self._check_rate_limit()
+        if self.latency:
+            time.sleep(self.latency)
+        return stub_completion(prompt, self.names)
+
+    def _check_rate_limit(self):
+        """Allow rate_limit calls in any one-second window, like a per-minute API quota scaled down"""
+        with _stub_lock:
+            now = time.monotonic()
+            recent = [t for t in self.call_times if now - t < 1.0]
+            if len(recent) >= self.rate_limit:
+                self.call_times[:] = recent
+                retry_in = 1.0 - (now - recent[0])
+                raise StubRateLimitError(f"429 Resource has been exhausted (e.g. check quota). Please retry in {retry_in:.3f}s")
+            recent.append(now)
+            self.call_times[:] = recent
+
+
+class ReplayLLM(LLM):
+    """Answers prompts from a JSONL recording written by RecordingLLM"""
+    model: str = "replay"
+    temperature: float = 0.0
+    completions: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: str, model: str, temperature: float) -> "ReplayLLM":
+        completions = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line of an interrupted recording
+                completions[entry["key"]] = entry["completion"]
+        return cls(model=model, temperature=temperature, completions=completions)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> str:
+        completion = self.completions.get(prompt_key(prompt))
+        if completion is None:
+            raise LookupError("Prompt not found in the LLM recording")
+        return completion
+
+
+class RecordingLLM(LLM):
+    """Wraps another LLM and appends every prompt and completion to a JSONL recording"""
+    inner: LLM
+    path: str
+    model: str = ""
+    temperature: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> str:
+        completion = self.inner.invoke(prompt, stop=stop)
+        line = json.dumps({"key": prompt_key(prompt), "prompt": prompt, "completion": completion})
+        with _record_lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return completion
+
+
+_record_lock = threading.Lock()
+_stub_lock = threading.Lock()
+
+
+def create_llm(backend: str, model: str, temperature: float) -> LLM:
+    """Build the configured backend; see the module docstring for the environment variables"""
+    if backend == "stub":
+        from pokeapi_standin import SYNTHETIC_NAMES
+        return StubLLM(
+            model=f"stub-{model}",
+            temperature=temperature,
+            latency=float(os.getenv("LLM_STUB_LATENCY", "0")),
+            rate_limit=float(os.getenv("LLM_STUB_RATE_LIMIT", "0")),
+            names=SYNTHETIC_NAMES
+        )
+    if backend == "replay":
+        return ReplayLLM.load(os.environ["LLM_RECORD_PATH"], model, temperature)
+    if backend == "gemini":
+        from langchain_google_genai import GoogleGenerativeAI
+        # One attempt per call: the server's scheduler owns 429 backoff and retries
+        llm = GoogleGenerativeAI(
+            model=model, google_api_key=os.getenv("GEMINI_API_KEY"), temperature=temperature, max_retries=1
+        )
+        record_path = os.getenv("LLM_RECORD_PATH")
+        if record_path:
+            return RecordingLLM(inner=llm, path=record_path, model=model, temperature=temperature)
+        return llm
+    raise ValueError(f"Unknown LLM_BACKEND '{backend}' (expected one of {', '.join(LLM_BACKENDS)})")
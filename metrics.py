@@ -0,0 +1,231 @@
+"""Minimal Prometheus text-format metrics and per-request trace spans
+
+Recording is a dict lookup plus a few integer/float updates and is meant to be
+called from the event loop, so no locking is done on the hot path.
+"""
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Any, Iterator
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import math
+import time
+
+# Seconds; spans sub-millisecond cache hits up to slow LLM completions
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Exposition lines for this metric, starting with its header"""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, value: float, *labels: str):
+        """Overwrite the value, for totals mirrored from another component at scrape time"""
+        self.values[labels] = value
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [non-cumulative bucket counts..., +Inf count], sum
+        self.counts: Dict[LabelValues, List[int]] = {}
+        self.sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str):
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {self.sums[labels]!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors, and renders the text exposition format"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Optional[Tuple[float, ...]] = None) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets or DEFAULT_BUCKETS))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run `collector` before each scrape, e.g. to copy cache stats into gauges"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+MAX_TRACE_SPANS = 256  # Keeps large batch requests from growing a trace without bound
+
+
+class Trace:
+    """Timed spans recorded while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []  # (name, start offset, duration) in seconds
+        self.dropped = 0
+
+    def add(self, name: str, started: float, duration: float):
+        if len(self.spans) < MAX_TRACE_SPANS:
+            self.spans.append((name, started - self.started, duration))
+        else:
+            self.dropped += 1
+
+    def summary(self) -> Dict[str, Tuple[int, float]]:
+        """Span name -> (count, total seconds), in first-seen order"""
+        totals: Dict[str, Tuple[int, float]] = {}
+        for name, _, duration in self.spans:
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + duration)
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: one entry per span name, plus the elapsed total"""
+        entries = []
+        for name, (count, total) in self.summary().items():
+            entry = f"{name};dur={total * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "spans": [
+                {"name": name, "start_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, offset, duration in self.spans
+            ],
+            "summary": {
+                name: {"count": count, "total_ms": round(total * 1000, 3)}
+                for name, (count, total) in self.summary().items()
+            },
+            "dropped_spans": self.dropped
+        }
+
+
+# Tasks spawned while serving a request copy this context, so their spans land in the same trace
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def request_trace() -> Iterator[Trace]:
+    """Make a new Trace current for the enclosed request handling"""
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def record_span(name: str, started: float, duration: float):
+    """Add an already-measured span to the current request's trace, if any"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, started, duration)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a span of the current request's trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter() - started)
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import json
 import time
 from typing import Dict, Any, List
 
@@ -486,6 +487,16 @@ def get_type_class(pokemon_type):
     return f"type-{pokemon_type.lower()}"
 
 
+def description_html(description: str) -> str:
+    """Trainer analysis box for a Pokémon description"""
+    return f"""
+    <div style="margin: 1rem 0; padding: 1.5rem; background: linear-gradient(145deg, #E6F3FF, #CCE7FF); border-radius: 15px; border: 3px solid #4169E1; color: #000080;">
+        <strong style="color: #FF4500;">🔍 TRAINER ANALYSIS:</strong><br>
+        <span style="font-family: 'Rajdhani', sans-serif; font-weight: 600; line-height: 1.5;">{description}</span>
+    </div>
+    """
+
+
 def display_pokemon_card(pokemon_data: Dict[str, Any], title: str = None):
     """Display Pokémon info in game style"""
     if not pokemon_data:
@@ -533,12 +544,7 @@ def display_pokemon_card(pokemon_data: Dict[str, Any], title: str = None):
 
         # Description
         if pokemon_data.get('description'):
-            st.markdown(f"""
-            <div style="margin: 1rem 0; padding: 1.5rem; background: linear-gradient(145deg, #E6F3FF, #CCE7FF); border-radius: 15px; border: 3px solid #4169E1; color: #000080;">
-                <strong style="color: #FF4500;">🔍 TRAINER ANALYSIS:</strong><br>
-                <span style="font-family: 'Rajdhani', sans-serif; font-weight: 600; line-height: 1.5;">{pokemon_data['description']}</span>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(description_html(pokemon_data['description']), unsafe_allow_html=True)
 
         # Base Stats with game-style bars
         stats = pokemon_data.get('stats', {})
@@ -561,6 +567,22 @@ def display_pokemon_card(pokemon_data: Dict[str, Any], title: str = None):
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+def api_error_message(e: Exception) -> str:
+    """User-facing message for a failed MCP server request"""
+    if isinstance(e, requests.exceptions.HTTPError):
+        if e.response.status_code == 404:
+            return "Pokémon not found. Please check the spelling and try again."
+        else:
+            error_detail = e.response.json().get('detail',
+                                                 'An unexpected error occurred.') if e.response.text else 'Server error occurred.'
+            return f"Server Error: {error_detail}"
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return "🔌 Could not connect to the MCP server. Please ensure it's running on localhost:8000"
+    if isinstance(e, requests.exceptions.Timeout):
+        return "⏱️ Request timed out. The server might be busy, please try again."
+    return f"Unexpected error: {str(e)}"
+
+
 def make_api_request(url: str, method: str = "GET", **kwargs):
     try:
         if method == "GET":
@@ -570,19 +592,23 @@ def make_api_request(url: str, method: str = "GET", **kwargs):
 
         response.raise_for_status()
         return response.json(), None
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            return None, "Pokémon not found. Please check the spelling and try again."
-        else:
-            error_detail = e.response.json().get('detail',
-                                                 'An unexpected error occurred.') if e.response.text else 'Server error occurred.'
-            return None, f"Server Error: {error_detail}"
-    except requests.exceptions.ConnectionError:
-        return None, "🔌 Could not connect to the MCP server. Please ensure it's running on localhost:8000"
-    except requests.exceptions.Timeout:
-        return None, "⏱️ Request timed out. The server might be busy, please try again."
     except Exception as e:
-        return None, f"Unexpected error: {str(e)}"
+        return None, api_error_message(e)
+
+
+def stream_api_events(url: str):
+    """Yield (event, data) pairs from one of the server's Server-Sent Events endpoints"""
+    with requests.get(url, stream=True, timeout=30, headers={"Accept": "text/event-stream"}) as response:
+        response.raise_for_status()
+        event = "message"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            if line.startswith("event:"):
+                event = line.split(":", 1)[1].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line.split(":", 1)[1])
+                event = "message"
 
 
 # Game-style Header
@@ -630,13 +656,32 @@ with tab1:
                 </p>
                 """, unsafe_allow_html=True)
 
-                data, error = make_api_request(f"{MCP_SERVER_URL}/pokemon/{search_name}")
+                error = None
+                data = None
+                description_placeholder = None
+                streamed_description = ""
+                try:
+                    # Stats arrive first; the AI description streams in afterwards
+                    for event, payload in stream_api_events(f"{MCP_SERVER_URL}/pokemon/{search_name}/stream"):
+                        if event == "pokemon":
+                            loading_placeholder.empty()
+                            data = payload
+                            display_pokemon_card(data)
+                            description_placeholder = st.empty()
+                        elif event == "token" and description_placeholder is not None:
+                            streamed_description += payload
+                            description_placeholder.markdown(description_html(streamed_description + " ▌"),
+                                                             unsafe_allow_html=True)
+                        elif event == "description" and description_placeholder is not None:
+                            description_placeholder.markdown(description_html(payload), unsafe_allow_html=True)
+                        elif event == "error":
+                            error = payload.get("detail", "AI analysis failed.")
+                except Exception as e:
+                    error = api_error_message(e)
 
                 loading_placeholder.empty()
 
                 if data:
-                    display_pokemon_card(data)
-
                     # Game-style info box
                     st.markdown("""
                     <div style="margin-top: 2rem; padding: 1.5rem; background: linear-gradient(145deg, #4169E1, #6495ED); border-radius: 20px; border: 3px solid #FFD700; color: white;">
@@ -647,7 +692,7 @@ with tab1:
                         </p>
                     </div>
                     """, unsafe_allow_html=True)
-                else:
+                if error:
                     st.error(f"❌ {error}")
         else:
             st.warning("⚠️ Please enter a Pokémon name to search.")
@@ -701,7 +746,9 @@ with tab2:
             </p>
             """, unsafe_allow_html=True)
 
-            data, error = make_api_request(f"{MCP_SERVER_URL}/compare/{pokemon1_name}/{pokemon2_name}")
+            data, error = make_api_request(
+                f"{MCP_SERVER_URL}/compare/{pokemon1_name}/{pokemon2_name}?include=description"
+            )
 
             loading_placeholder.empty()
 
@@ -734,13 +781,33 @@ with tab2:
             </p>
             """, unsafe_allow_html=True)
 
-            time.sleep(2)  # pause
-            data, error = make_api_request(f"{MCP_SERVER_URL}/battle/{pokemon1_name}/{pokemon2_name}")
+            battle_result = None
+            error = None
+            analysis_placeholder = st.empty()
+            streamed_analysis = ""
+            try:
+                # Show the AI's reasoning as it is written, then the parsed verdict
+                for event, payload in stream_api_events(f"{MCP_SERVER_URL}/battle/{pokemon1_name}/{pokemon2_name}/stream"):
+                    if event == "token":
+                        loading_placeholder.empty()
+                        streamed_analysis += payload
+                        analysis_placeholder.markdown(f"""
+                        <div style="background: linear-gradient(145deg, #2C3E50, #34495E); padding: 1.5rem; border-radius: 20px; margin: 1rem 0; border: 3px solid #FFD700; color: white;">
+                            <h4 style="color: #FFD700; font-family: 'Orbitron', monospace; font-weight: 700;">⚡ LIVE BATTLE FEED</h4>
+                            <p style="font-family: 'Rajdhani', sans-serif; font-weight: 600; line-height: 1.6; white-space: pre-wrap;">{streamed_analysis} ▌</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    elif event == "battle_result":
+                        battle_result = payload
+                    elif event == "error":
+                        error = payload.get("detail", "Battle analysis failed.")
+            except Exception as e:
+                error = api_error_message(e)
 
             loading_placeholder.empty()
+            analysis_placeholder.empty()
 
-            if data:
-                battle_result = data.get('battle_result', {})
+            if battle_result:
                 winner = battle_result.get('winner', 'Unknown')
                 confidence = battle_result.get('confidence', 'Medium')
 
@@ -773,7 +840,7 @@ with tab2:
                             </div>
                             """, unsafe_allow_html=True)
             else:
-                st.error(f"❌ {error}")
+                st.error(f"❌ {error or 'Battle analysis failed.'}")
 
 with tab3:
      # custom CSS for better text input styling and help text
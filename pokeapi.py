@@ -0,0 +1,216 @@
+"""PokeAPI access shared by the MCP server and the offline tooling"""
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from urllib.parse import urlsplit
+from datetime import datetime
+import asyncio
+import gzip
+import json
+import os
+import time
+
+import httpx
+
+SNAPSHOT_FORMAT = "pokemon-mcp-snapshot"
+SNAPSHOT_VERSION = 1
+
+# The 18 battle types, in PokeAPI id order (excludes "unknown", "shadow" and "stellar")
+BATTLE_TYPES = [
+    "normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel",
+    "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy"
+]
+
+
+class PokeAPIClient:
+    """Shared keep-alive HTTP client used for every PokeAPI call"""
+
+    def __init__(self, base_url: str, timeout: float, max_connections: int,
+                 max_keepalive: int, keepalive_expiry: float, per_host_limit: int,
+                 observer: Optional[Callable[[str, float, Optional[str]], None]] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.per_host_limit = per_host_limit
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Called with (resource, seconds, error or None) after every request
+        self.observer = observer
+        self.in_flight = 0
+
+    async def start(self):
+        """Open the connection pool (called from the app lifespan)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={"User-Agent": "pokemon-mcp-server/2.0.0"}
+            )
+
+    async def close(self):
+        """Close the connection pool and drop idle keep-alive sockets"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def get_json(self, path: str) -> Dict[str, Any]:
+        """GET a PokeAPI resource; httpx errors are left for the caller to map"""
+        if self._client is None:
+            # Used outside the app lifespan (scripts, tests)
+            await self.start()
+
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        started = time.perf_counter()
+        error = None
+        self.in_flight += 1
+        try:
+            async with self._host_semaphore(url):
+                response = await self._client.get(url)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error = str(e.response.status_code)
+            raise
+        except (httpx.HTTPError, ValueError) as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.in_flight -= 1
+            if self.observer is not None:
+                self.observer(resource_name(url), time.perf_counter() - started, error)
+
+
+def resource_name(url: str) -> str:
+    """PokeAPI resource type of a URL ("pokemon", "pokemon-species", "type", ...)
+
+    Listings ("pokemon?limit=100000") get a "_list" suffix, so their much larger
+    responses stay out of the single-record latencies.
+    """
+    path = urlsplit(url).path
+    parts = path.split("/api/v2/", 1)[-1].strip("/").split("/")
+    if not parts[0]:
+        return "root"
+    return parts[0] if len(parts) > 1 else f"{parts[0]}_list"
+
+
+def normalize_pokemon(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw PokeAPI /pokemon payload into PokemonData fields"""
+    return {
+        "name": data["name"].capitalize(),
+        "id": data["id"],
+        "height": data["height"] / 10,  # Convert to meters
+        "weight": data["weight"] / 10,  # Convert to kg
+        "abilities": [
+            ability["ability"]["name"].replace("-", " ").title()
+            for ability in data["abilities"]
+        ],
+        "types": [
+            pok_type["type"]["name"].capitalize()
+            for pok_type in data["types"]
+        ],
+        "stats": {
+            stat["stat"]["name"].replace("-", " ").title(): stat["base_stat"]
+            for stat in data["stats"]
+        },
+        "sprite": data["sprites"]["front_default"]
+    }
+
+
+def english_flavor_text(species: Dict[str, Any]) -> Optional[str]:
+    """Pick the newest English Pokedex entry from a /pokemon-species payload"""
+    entries = [
+        entry["flavor_text"] for entry in species.get("flavor_text_entries", [])
+        if entry.get("language", {}).get("name") == "en"
+    ]
+    if not entries:
+        return None
+    # PokeAPI keeps the original cartridge line breaks and form feeds
+    return " ".join(entries[-1].split())
+
+
+async def fetch_type_chart(get_json: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build the attacking-by-defending multiplier table from PokeAPI /type damage relations"""
+    payloads = await asyncio.gather(*(get_json(f"type/{type_name}") for type_name in BATTLE_TYPES))
+    index = {type_name: i for i, type_name in enumerate(BATTLE_TYPES)}
+    multipliers = [[1.0] * len(BATTLE_TYPES) for _ in BATTLE_TYPES]
+
+    for attacking, payload in zip(BATTLE_TYPES, payloads):
+        relations = payload["damage_relations"]
+        for relation, multiplier in (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0)):
+            for defending in relations[relation]:
+                if defending["name"] in index:
+                    multipliers[index[attacking]][index[defending["name"]]] = multiplier
+
+    return {"types": list(BATTLE_TYPES), "multipliers": multipliers}
+
+
+def write_snapshot(path: str, records: List[Dict[str, Any]], source: str,
+                   type_chart: Optional[Dict[str, Any]] = None):
+    """Atomically write a gzip-compressed, versioned Pokedex snapshot"""
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "source": source,
+        "count": len(records),
+        "type_chart": type_chart,
+        "pokemon": sorted(records, key=lambda record: record["id"])
+    }
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class PokedexSnapshot:
+    """In-memory Pokedex loaded from a snapshot file, indexed by name, species and id"""
+
+    def __init__(self, payload: Dict[str, Any], path: Optional[str] = None):
+        if payload.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path or 'snapshot'} is not a Pokedex snapshot")
+        if payload.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {payload.get('version')} (expected {SNAPSHOT_VERSION})"
+            )
+        self.path = path
+        self.created_at = payload.get("created_at")
+        self.source = payload.get("source")
+        self.records: List[Dict[str, Any]] = payload["pokemon"]
+        # Optional: snapshots built before the type chart was added do not carry one
+        self.type_chart: Optional[Dict[str, Any]] = payload.get("type_chart")
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            self._by_key[record["name"].lower()] = record
+            self._by_key[str(record["id"])] = record
+            if record.get("species"):
+                self._by_key.setdefault(record["species"], record)
+
+    @classmethod
+    def load(cls, path: str) -> "PokedexSnapshot":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._by_key.get(key)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "version": SNAPSHOT_VERSION,
+            "created_at": self.created_at,
+            "source": self.source,
+            "count": len(self.records),
+            "has_type_chart": self.type_chart is not None
+        }
@@ -0,0 +1,273 @@
+"""Local PokeAPI stand-in serving recorded responses, with latency and fault injection
+
+Serves the /pokemon, /pokemon-species, /type and /move routes from a cassette
+directory (one JSON file per resource path). With --record, misses are fetched
+once from the real PokeAPI and written to the cassette, so later runs work
+without network access. --synthetic serves the deterministic fixtures used by
+bench.py instead of a cassette.
+
+    python pokeapi_standin.py --cassette ./pokeapi_cassette --record --port 8001
+    POKEAPI_BASE_URL=http://127.0.0.1:8001/api/v2/ uvicorn cmcp:app
+"""
+from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+
+import httpx
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from pokeapi import BATTLE_TYPES
+
+logger = logging.getLogger("pokeapi_standin")
+
+RESOURCES = {"pokemon", "pokemon-species", "type", "move"}
+SEGMENT = re.compile(r"^[a-z0-9-]+$")
+LIST_LIMIT = 100000  # Recorded lists hold every entry; offset/limit are applied when serving
+
+# Attacking type -> (double damage to, half damage to, no damage to)
+TYPE_RELATIONS = {
+    "normal": ([], ["rock", "steel"], ["ghost"]),
+    "fighting": (["normal", "rock", "steel", "ice", "dark"], ["flying", "poison", "bug", "psychic", "fairy"], ["ghost"]),
+    "flying": (["fighting", "bug", "grass"], ["rock", "steel", "electric"], []),
+    "poison": (["grass", "fairy"], ["poison", "ground", "rock", "ghost"], ["steel"]),
+    "ground": (["poison", "rock", "steel", "fire", "electric"], ["bug", "grass"], ["flying"]),
+    "rock": (["flying", "bug", "fire", "ice"], ["fighting", "ground", "steel"], []),
+    "bug": (["grass", "psychic", "dark"], ["fighting", "flying", "poison", "ghost", "steel", "fire", "fairy"], []),
+    "ghost": (["ghost", "psychic"], ["dark"], ["normal"]),
+    "steel": (["rock", "ice", "fairy"], ["steel", "fire", "water", "electric"], []),
+    "fire": (["bug", "steel", "grass", "ice"], ["rock", "fire", "water", "dragon"], []),
+    "water": (["ground", "rock", "fire"], ["water", "grass", "dragon"], []),
+    "grass": (["ground", "rock", "water"], ["flying", "poison", "bug", "steel", "fire", "grass", "dragon"], []),
+    "electric": (["flying", "water"], ["grass", "electric", "dragon"], ["ground"]),
+    "psychic": (["fighting", "poison"], ["steel", "psychic"], ["dark"]),
+    "ice": (["flying", "ground", "grass", "dragon"], ["steel", "fire", "water", "ice"], []),
+    "dragon": (["dragon"], ["steel"], ["fairy"]),
+    "dark": (["ghost", "psychic"], ["fighting", "dark", "fairy"], []),
+    "fairy": (["fighting", "dragon", "dark"], ["poison", "steel", "fire"], []),
+}
+
+SYNTHETIC_NAMES = [
+    "bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard", "squirtle", "wartortle",
+    "blastoise", "butterfree", "beedrill", "pidgeot", "raticate", "fearow", "arbok", "pikachu", "raichu",
+    "sandslash", "nidoqueen", "nidoking", "clefable", "ninetales", "wigglytuff", "vileplume", "parasect",
+    "venomoth", "dugtrio", "persian", "golduck", "primeape", "arcanine", "poliwrath", "alakazam", "machamp",
+    "victreebel", "tentacruel", "golem", "rapidash", "slowbro", "magneton", "dodrio", "dewgong", "muk",
+    "cloyster", "gengar", "onix", "hypno", "kingler", "electrode", "exeggutor", "marowak", "hitmonlee",
+    "lickitung", "weezing", "rhydon", "chansey", "tangela", "kangaskhan", "starmie", "scyther", "jynx",
+    "electabuzz", "magmar", "pinsir", "tauros", "gyarados", "lapras", "ditto", "vaporeon", "jolteon",
+    "flareon", "porygon", "omastar", "kabutops", "aerodactyl", "snorlax", "articuno", "zapdos", "moltres",
+    "dragonite", "mewtwo", "mew"
+]
+
+
+def synthetic_pokeapi(seed: int) -> Dict[str, Any]:
+    """PokeAPI payloads keyed by path (e.g. "pokemon/pikachu"), generated deterministically"""
+    rng = random.Random(seed)
+    fixtures: Dict[str, Any] = {}
+    stat_names = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+    for pokemon_id, name in enumerate(SYNTHETIC_NAMES, 1):
+        types = rng.sample(BATTLE_TYPES, rng.choice([1, 2]))
+        payload = {
+            "id": pokemon_id,
+            "name": name,
+            "height": rng.randint(3, 40),
+            "weight": rng.randint(20, 2000),
+            "abilities": [{"ability": {"name": rng.choice(["overgrow", "blaze", "torrent", "static", "levitate"])}}],
+            "types": [{"slot": slot, "type": {"name": type_name}} for slot, type_name in enumerate(types, 1)],
+            "stats": [{"base_stat": rng.randint(30, 150), "stat": {"name": stat}} for stat in stat_names],
+            "sprites": {"front_default": f"https://example.invalid/sprites/{pokemon_id}.png"},
+            "species": {"name": name}
+        }
+        fixtures[f"pokemon/{name}"] = payload
+        fixtures[f"pokemon/{pokemon_id}"] = payload
+        fixtures[f"pokemon-species/{name}"] = {
+            "id": pokemon_id,
+            "name": name,
+            "varieties": [{"is_default": True, "pokemon": {"name": name}}],
+            "flavor_text_entries": [{"flavor_text": f"A synthetic {name}.", "language": {"name": "en"}}]
+        }
+
+    listing = [{"name": name} for name in SYNTHETIC_NAMES]
+    fixtures["pokemon"] = {"count": len(listing), "results": listing}
+    fixtures["pokemon-species"] = {"count": len(listing), "results": listing}
+
+    for type_name, (double, half, none) in TYPE_RELATIONS.items():
+        fixtures[f"type/{type_name}"] = {
+            "name": type_name,
+            "damage_relations": {
+                "double_damage_to": [{"name": t} for t in double],
+                "half_damage_to": [{"name": t} for t in half],
+                "no_damage_to": [{"name": t} for t in none]
+            }
+        }
+    return fixtures
+
+
+class Cassette:
+    """Recorded PokeAPI responses, one JSON file per resource path under a directory"""
+
+    def __init__(self, root: Optional[str] = None, fixtures: Optional[Dict[str, Any]] = None):
+        self.root = root
+        self._memory: Dict[str, Any] = dict(fixtures or {})
+
+    def _file(self, path: str) -> str:
+        resource, _, key = path.partition("/")
+        return os.path.join(self.root, resource, f"{key or '_list'}.json")
+
+    def get(self, path: str) -> Optional[Any]:
+        if path in self._memory:
+            return self._memory[path]
+        if self.root is None:
+            return None
+        try:
+            with open(self._file(path), encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        self._memory[path] = payload
+        return payload
+
+    def put(self, path: str, payload: Any):
+        self._memory[path] = payload
+        if self.root is None:
+            return
+        file_path = self._file(path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, file_path)
+
+
+def create_app(cassette: Cassette, upstream: Optional[str] = None, latency: float = 0.0, jitter: float = 0.0,
+               error_rate: float = 0.0, error_status: int = 503, seed: int = 0) -> FastAPI:
+    """Build the stand-in app; `upstream` enables recording misses from the real PokeAPI"""
+    rng = random.Random(seed)
+    stats = {"hits": 0, "misses": 0, "recorded": 0, "injected_errors": 0}
+    state: Dict[str, Any] = {"client": None}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if upstream:
+            state["client"] = httpx.AsyncClient(timeout=30, headers={"User-Agent": "pokemon-mcp-standin/1.0"})
+        try:
+            yield
+        finally:
+            if state["client"] is not None:
+                await state["client"].aclose()
+
+    app = FastAPI(title="PokeAPI stand-in", lifespan=lifespan)
+
+    async def record(path: str) -> Optional[Any]:
+        resource, _, key = path.partition("/")
+        url = f"{upstream}{path}" if key else f"{upstream}{resource}?limit={LIST_LIMIT}"
+        response = await state["client"].get(url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        payload = response.json()
+        cassette.put(path, payload)
+        # Entries are requested by name and by id; store both so either replays
+        if key and isinstance(payload, dict):
+            for alias in (payload.get("name"), payload.get("id")):
+                if alias is not None and str(alias) != key:
+                    cassette.put(f"{resource}/{alias}", payload)
+        stats["recorded"] += 1
+        logger.info(f"Recorded {path}")
+        return payload
+
+    @app.get("/_standin/stats")
+    async def standin_stats():
+        return stats
+
+    @app.get("/api/v2/{path:path}")
+    async def serve(path: str, limit: int = Query(20, ge=1), offset: int = Query(0, ge=0)):
+        path = path.strip("/").lower()
+        resource, _, key = path.partition("/")
+        if resource not in RESOURCES or (key and not SEGMENT.match(key)):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        delay = latency + (rng.uniform(0, jitter) if jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            stats["injected_errors"] += 1
+            return PlainTextResponse("Injected failure", status_code=error_status, headers={"Retry-After": "1"})
+
+        payload = cassette.get(path)
+        if payload is not None:
+            stats["hits"] += 1
+        else:
+            stats["misses"] += 1
+            if state["client"] is not None:
+                try:
+                    payload = await record(path)
+                except httpx.HTTPError as e:
+                    logger.warning(f"Recording {path} failed: {e}")
+                    return PlainTextResponse("Upstream error", status_code=502)
+        if payload is None:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        if not key:
+            # PokeAPI list pages; recordings keep the full list
+            results = payload["results"]
+            page = results[offset:offset + limit]
+            payload = {
+                "count": len(results),
+                "next": None if offset + limit >= len(results) else f"/api/v2/{resource}/?offset={offset + limit}&limit={limit}",
+                "previous": None if offset == 0 else f"/api/v2/{resource}/?offset={max(0, offset - limit)}&limit={limit}",
+                "results": page
+            }
+        return JSONResponse(payload)
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve recorded PokeAPI responses locally")
+    parser.add_argument("--cassette", help="Directory of recorded responses")
+    parser.add_argument("--synthetic", action="store_true", help="Serve bench.py's synthetic fixtures")
+    parser.add_argument("--record", action="store_true", help="Fetch misses from --upstream and add them to the cassette")
+    parser.add_argument("--upstream", default="https://pokeapi.co/api/v2/", help="PokeAPI base URL used when recording")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code for injected failures (e.g. 429, 500, 503)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter, errors and synthetic fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    if not args.cassette and not args.synthetic:
+        parser.error("Pass --cassette DIR, --synthetic, or both")
+    if args.record and not args.cassette:
+        parser.error("--record needs --cassette to write to")
+
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cassette = Cassette(args.cassette, synthetic_pokeapi(args.seed) if args.synthetic else None)
+    app = create_app(
+        cassette,
+        upstream=args.upstream if args.record else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Node-local cache shared by every worker process through a memory-mapped file
+
+The file is a fixed table of equal-size slots. A key hashes to a short run of
+PROBES slots; each slot holds one JSON-encoded entry behind a sequence counter
+(a seqlock). Readers never lock: they read the counter, copy the entry, and
+read the counter again, retrying if a writer was active. Writers serialize
+with flock on the file (plus a thread lock inside one process), set the counter
+odd while writing and even when done. Entries larger than a slot are not shared.
+
+Put the file on tmpfs (e.g. /dev/shm) so it never touches disk. Every worker
+must use the same slot count and slot size; a file with a different layout, or
+a non-empty file that is not a shared cache, is rejected rather than resized or
+overwritten.
+"""
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so no safe cross-process writes
+    fcntl = None
+
+MAGIC = b"PMCPSHC1"
+FILE_HEADER = struct.Struct("<8sII")  # magic, slot count, slot size
+FILE_HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QQdII")  # sequence, key hash, expires at (epoch seconds), key length, value length
+SEQUENCE = struct.Struct("<Q")
+PROBES = 4  # Slots a key may occupy; the one expiring soonest is evicted when all are taken
+READ_RETRIES = 3
+
+
+def key_hash(key: bytes) -> int:
+    # Never 0, which marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") | 1
+
+
+class SharedCache:
+    """Fixed-size, lock-free-read cache of JSON values in a memory-mapped file"""
+
+    def __init__(self, path: str, slots: int = 4096, slot_size: int = 4096):
+        if fcntl is None:
+            raise OSError("The shared cache needs fcntl.flock, which this platform does not provide")
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError(f"slot_size must be larger than {SLOT_HEADER.size} bytes")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._mm = self._map()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.oversized = 0
+        self.torn_reads = 0
+
+    def _map(self) -> mmap.mmap:
+        size = FILE_HEADER_SIZE + self.slots * self.slot_size
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, FILE_HEADER.size, 0)
+            if not header or (not header.strip(b"\0") and os.fstat(self._fd).st_size == size):
+                # New file, or one whose initialization was interrupted: size it and stamp the layout
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, FILE_HEADER.pack(MAGIC, self.slots, self.slot_size), 0)
+            elif header[:len(MAGIC)] != MAGIC:
+                # Never overwrite a file we did not create, e.g. from a mistyped SHARED_CACHE_PATH
+                raise ValueError(f"{self.path} exists and is not a shared cache file")
+            else:
+                _, slots, slot_size = FILE_HEADER.unpack(header)
+                if (slots, slot_size) != (self.slots, self.slot_size):
+                    raise ValueError(
+                        f"{self.path} holds {slots} slots of {slot_size} bytes, not {self.slots} of "
+                        f"{self.slot_size}; use matching settings in every worker or remove the file"
+                    )
+            return mmap.mmap(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offsets(self, hashed: int):
+        for probe in range(PROBES):
+            yield FILE_HEADER_SIZE + ((hashed + probe) % self.slots) * self.slot_size
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under key, or None if absent, expired or being rewritten"""
+        encoded = key.encode("utf-8")
+        hashed = key_hash(encoded)
+        now = time.time()
+        for offset in self._offsets(hashed):
+            found, value = self._read(offset, encoded, hashed, now)
+            if found:
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def _read(self, offset: int, key: bytes, hashed: int, now: float) -> Tuple[bool, Any]:
+        mm = self._mm
+        for _ in range(READ_RETRIES):
+            sequence = SEQUENCE.unpack_from(mm, offset)[0]
+            if sequence & 1:
+                self.torn_reads += 1
+                continue  # Writer active
+            _, slot_hash, expires_at, key_length, value_length = SLOT_HEADER.unpack_from(mm, offset)
+            if slot_hash != hashed:
+                return False, None
+            start = offset + SLOT_HEADER.size
+            payload = mm[start:start + key_length + value_length]
+            if SEQUENCE.unpack_from(mm, offset)[0] != sequence:
+                self.torn_reads += 1
+                continue  # Rewritten while copying
+            if payload[:key_length] != key or expires_at <= now:
+                return False, None
+            return True, json.loads(payload[key_length:])
+        return False, None
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a JSON-serializable value for ttl seconds; values too large for a slot are skipped"""
+        encoded = key.encode("utf-8")
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if SLOT_HEADER.size + len(encoded) + len(payload) > self.slot_size:
+            self.oversized += 1
+            return
+        hashed = key_hash(encoded)
+        now = time.time()
+        expires_at = now + ttl if ttl != float("inf") else float("inf")
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                offset = self._choose_slot(encoded, hashed, now)
+                self._write(offset, hashed, expires_at, encoded, payload)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self.writes += 1
+
+    def _choose_slot(self, key: bytes, hashed: int, now: float) -> int:
+        """The key's own slot, else a free or expired one, else the one expiring soonest"""
+        mm = self._mm
+        free = None
+        victim, victim_expires = None, float("inf")
+        for offset in self._offsets(hashed):
+            _, slot_hash, expires_at, key_length, _ = SLOT_HEADER.unpack_from(mm, offset)
+            start = offset + SLOT_HEADER.size
+            if slot_hash == hashed and mm[start:start + key_length] == key:
+                return offset
+            if free is None and (slot_hash == 0 or expires_at <= now):
+                free = offset
+            if victim is None or expires_at < victim_expires:
+                victim, victim_expires = offset, expires_at
+        if free is not None:
+            return free
+        self.evictions += 1
+        return victim
+
+    def _write(self, offset: int, hashed: int, expires_at: float, key: bytes, payload: bytes):
+        mm = self._mm
+        sequence = SEQUENCE.unpack_from(mm, offset)[0]
+        # Odd while writing; an odd value found here was left by a writer that died mid-write
+        writing = sequence if sequence & 1 else sequence + 1
+        SEQUENCE.pack_into(mm, offset, writing)
+        SLOT_HEADER.pack_into(mm, offset, writing, hashed, expires_at, len(key), len(payload))
+        start = offset + SLOT_HEADER.size
+        mm[start:start + len(key) + len(payload)] = key + payload
+        SEQUENCE.pack_into(mm, offset, writing + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        used = 0
+        for slot in range(self.slots):
+            _, slot_hash, expires_at, _, _ = SLOT_HEADER.unpack_from(self._mm, FILE_HEADER_SIZE + slot * self.slot_size)
+            if slot_hash and expires_at > now:
+                used += 1
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "slots": self.slots,
+            "slot_size": self.slot_size,
+            "used_slots": used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "oversized": self.oversized,
+            "torn_reads": self.torn_reads,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
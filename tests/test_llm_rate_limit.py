@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from cmcp import AdaptiveRateLimiter, is_rate_limited, rate_limit_delay
+from llm_backends import StubRateLimitError
+
+
+class StatusError(Exception):
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.code = code
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, message: str, status_code: int, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = Response(headers or {})
+
+
+def wrapped(cause: BaseException) -> RuntimeError:
+    try:
+        raise RuntimeError("Error calling model") from cause
+    except RuntimeError as e:
+        return e
+
+
+@pytest.mark.parametrize("error, delay", [
+    (StubRateLimitError("429 Resource has been exhausted (e.g. check quota). Please retry in 2.5s"), 2.5),
+    (ResourceExhausted("quota"), 0.0),
+    (StatusError("slow down", 429), 0.0),
+    (HTTPStatusError("Too Many Requests", 429, {"retry-after": "7"}), 7.0),
+    (RuntimeError("429 Too Many Requests"), 0.0),
+    (RuntimeError("Error code: 429 - retry_delay { seconds: 12 }"), 12.0),
+    (wrapped(StubRateLimitError("429 Resource has been exhausted. Please retry in 1.5s")), 1.5),
+])
+def test_rate_limit_errors_and_their_retry_hints(error, delay):
+    assert is_rate_limited(error)
+    assert rate_limit_delay(error) == delay
+
+
+@pytest.mark.parametrize("error", [
+    # A non-429 status decides, whatever the message says
+    StatusError("quota of 429 requests per project", 500),
+    HTTPStatusError("429 Too Many Requests", 503),
+    wrapped(StatusError("429", 400)),
+    # Mentioning 429 or quota in passing is not a rate limit
+    ValueError("Got 429 team members; check quota"),
+    ValueError("Invalid team: quota exceeded"),
+    RuntimeError("boom"),
+])
+def test_other_errors_are_not_rate_limits(error):
+    assert not is_rate_limited(error)
+    assert rate_limit_delay(error) is None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_unlimited_until_the_first_rate_limit(clock):
+    limiter = AdaptiveRateLimiter(max_rate=0, min_rate=0.5, increase=0.1, decrease=0.5)
+    for _ in range(40):
+        assert limiter.delay() == 0.0
+        limiter.take()
+        limiter.on_success()
+    assert limiter.stats()["rate_per_second"] is None
+
+    # Half the observed rate, and every call pauses for the retry hint
+    limiter.on_rate_limited(2.0)
+    assert limiter.rate == 20.0
+    assert limiter.delay() == 2.0
+
+
+def test_burst_of_rate_limits_counts_as_one_decrease(clock):
+    limiter = AdaptiveRateLimiter(max_rate=10, min_rate=1, increase=0.5, decrease=0.5)
+    for _ in range(3):
+        limiter.on_rate_limited(0.0)
+    assert limiter.rate == 5.0
+    assert limiter.throttled == 3
+
+    clock[0] += 1.0
+    limiter.on_rate_limited(0.0)
+    assert limiter.rate == 2.5
+
+    for _ in range(5):
+        clock[0] += 1.0
+        limiter.on_rate_limited(0.0)
+    assert limiter.rate == 1.0  # Never below min_rate
+
+
+def test_additive_recovery_is_capped_at_max_rate(clock):
+    limiter = AdaptiveRateLimiter(max_rate=4, min_rate=1, increase=0.5, decrease=0.5)
+    limiter.on_rate_limited(0.0)
+    assert limiter.rate == 2.0
+
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 3.0
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 4.0
+
+
+def test_token_bucket_spaces_calls_at_the_current_rate(clock):
+    limiter = AdaptiveRateLimiter(max_rate=2, min_rate=1, increase=0.5, decrease=0.5)
+    # Up to one second's worth of calls may start back to back
+    clock[0] += 2.0
+    assert limiter.delay() == 0.0
+    limiter.take()
+    assert limiter.delay() == 0.0
+    limiter.take()
+    assert limiter.delay() == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert limiter.delay() == 0.0
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from shared_cache import FILE_HEADER_SIZE, PROBES, SEQUENCE, SharedCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shared.cache")
+
+
+def test_round_trip_between_mappings(path):
+    writer = SharedCache(path, slots=64, slot_size=512)
+    reader = SharedCache(path, slots=64, slot_size=512)
+    writer.set("pokemon:pikachu", {"name": "pikachu", "types": ["Electric"]}, ttl=60)
+
+    assert reader.get("pokemon:pikachu") == {"name": "pikachu", "types": ["Electric"]}
+    assert reader.get("pokemon:raichu") is None
+
+    writer.set("pokemon:pikachu", {"name": "pikachu", "types": []}, ttl=60)
+    assert reader.get("pokemon:pikachu") == {"name": "pikachu", "types": []}
+    assert reader.hits == 2 and reader.misses == 1
+
+
+def test_expired_entries_are_misses(path):
+    cache = SharedCache(path, slots=64, slot_size=512)
+    cache.set("old", "value", ttl=-1)
+    cache.set("forever", "value", ttl=float("inf"))
+
+    assert cache.get("old") is None
+    assert cache.get("forever") == "value"
+
+
+def test_oversized_values_are_not_stored(path):
+    cache = SharedCache(path, slots=64, slot_size=128)
+    cache.set("big", "x" * 200, ttl=60)
+
+    assert cache.get("big") is None
+    assert cache.oversized == 1
+
+
+def test_entry_being_written_reads_as_miss(path):
+    cache = SharedCache(path, slots=1, slot_size=256)
+    cache.set("key", "value", ttl=60)
+    # An odd sequence number marks a write in progress
+    SEQUENCE.pack_into(cache._mm, FILE_HEADER_SIZE, SEQUENCE.unpack_from(cache._mm, FILE_HEADER_SIZE)[0] + 1)
+
+    assert cache.get("key") is None
+    assert cache.torn_reads > 0
+
+    # The next writer recovers the slot
+    cache.set("key", "new", ttl=60)
+    assert cache.get("key") == "new"
+
+
+def test_full_probe_run_evicts_entry_expiring_soonest(path):
+    # With as many slots as probes, every key competes for the same slots
+    cache = SharedCache(path, slots=PROBES, slot_size=256)
+    for i in range(PROBES):
+        cache.set(f"key{i}", i, ttl=100 + i)
+    cache.set("newcomer", "new", ttl=1000)
+
+    assert cache.evictions == 1
+    assert cache.get("key0") is None
+    assert cache.get("newcomer") == "new"
+    assert [cache.get(f"key{i}") for i in range(1, PROBES)] == list(range(1, PROBES))
+
+
+def test_mismatched_layout_is_rejected(path):
+    SharedCache(path, slots=64, slot_size=512).set("key", "value", ttl=60)
+
+    with pytest.raises(ValueError):
+        SharedCache(path, slots=32, slot_size=512)
+    assert SharedCache(path, slots=64, slot_size=512).get("key") == "value"
+
+
+def test_foreign_file_is_left_untouched(path):
+    with open(path, "w") as f:
+        f.write("not a cache\n")
+
+    with pytest.raises(ValueError):
+        SharedCache(path, slots=64, slot_size=512)
+    with open(path) as f:
+        assert f.read() == "not a cache\n"
+    assert os.path.getsize(path) == len("not a cache\n")